@@ -1,27 +1,36 @@
 # app.py - Weather Visualization Application with Multi-file Upload Support and File Management
 
 from fastapi import FastAPI, UploadFile, File, Request, Form, HTTPException, BackgroundTasks, Query
-from fastapi.responses import HTMLResponse, JSONResponse, FileResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 import xarray as xr
 import numpy as np
+import dask
 import os
 import sys
-import json
+import orjson
+import re
 import tempfile
 import traceback
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Any  # Make sure 'Any' is imported
-import aiofiles
+import base64
+import hashlib
+import itertools
 from datetime import datetime
 import logging
 import asyncio
+import time
 from pydantic import BaseModel
 from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from cachetools import TTLCache
 import uuid
+import threading
+import warnings
 import shutil
 
 # Fix for Windows path issues
@@ -34,7 +43,7 @@ if sys.platform == "win32":
 load_dotenv()
 
 # Import modules
-from tileset_management import MapboxTilesetManager
+from tileset_management import MapboxTilesetManager, U_WIND_RE, V_WIND_RE
 from mts_raster_manager import MTSRasterManager
 from mapbox_dataset_manager import MapboxDatasetManager
 
@@ -46,7 +55,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
-app = FastAPI(title="Weather Visualization Platform", version="5.0.0")
+app = FastAPI(
+    title="Weather Visualization Platform",
+    version="5.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Enable CORS
 app.add_middleware(
@@ -65,8 +78,20 @@ class Config:
     RECIPE_DIR = BASE_DIR / "recipes"
     STATIC_DIR = BASE_DIR / "static"
     TEMPLATES_DIR = BASE_DIR / "templates"
+    
+    # String forms for hot paths that only need to build or open a path
+    UPLOAD_DIR_STR = str(UPLOAD_DIR)
+    PROCESSED_DIR_STR = str(PROCESSED_DIR)
+    RECIPE_DIR_STR = str(RECIPE_DIR)
     MAX_FILE_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", "500")) * 1024 * 1024  # MB to bytes
     MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", "10"))  # Maximum files in one batch
+    TILESET_CACHE_TTL = int(os.getenv("TILESET_CACHE_TTL", "60"))  # Seconds to reuse Mapbox tileset listings
+    REDIS_URL = os.getenv("REDIS_URL", "")  # Share visualization state between workers when set
+    REDIS_STATE_TTL = 24 * 3600
+    TILESET_WORKERS = int(os.getenv("TILESET_WORKERS", "2"))  # Concurrent Mapbox tileset creations
+    SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "128"))  # Wind-data sessions kept in memory
+    SESSION_TTL = int(os.getenv("SESSION_TTL", "3600"))  # Seconds before a wind-data session is evicted
+    ZARR_CACHE = os.getenv("ZARR_CACHE", "False").lower() == "true"  # Keep a Zarr copy of each upload for re-reads
     
     # Load Mapbox credentials
     MAPBOX_USERNAME = os.getenv("MAPBOX_USERNAME", "")
@@ -90,6 +115,27 @@ else:
 
 templates = Jinja2Templates(directory=str(Config.TEMPLATES_DIR))
 
+# Largest request body accepted per upload endpoint
+UPLOAD_BODY_LIMITS = {
+    "/api/upload-netcdf": Config.MAX_FILE_SIZE,
+    "/api/upload-netcdf-as-dataset": Config.MAX_FILE_SIZE,
+    "/api/upload-netcdf-batch": Config.MAX_FILE_SIZE * Config.MAX_BATCH_SIZE,
+    "/api/upload-netcdf-batch-as-datasets": Config.MAX_FILE_SIZE * Config.MAX_BATCH_SIZE,
+}
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    """Reject oversize uploads from Content-Length before the body is read"""
+    if request.method == "POST":
+        limit = UPLOAD_BODY_LIMITS.get(request.url.path)
+        content_length = request.headers.get('content-length')
+        if limit and content_length and content_length.isdigit() and int(content_length) > limit:
+            return ORJSONResponse(
+                {"detail": f"Upload too large. Maximum size is {limit / 1024 / 1024}MB"},
+                status_code=413
+            )
+    return await call_next(request)
+
 # Log configuration
 logger.info(f"Base directory: {Config.BASE_DIR}")
 logger.info(f"Static directory: {Config.STATIC_DIR}")
@@ -131,14 +177,72 @@ class FileInfo(BaseModel):
 
 # In-memory storage
 active_visualizations = {}
-active_sessions = {}  # Store session data for client-side animation
+# Client-side animation data; /api/wind-data re-extracts evicted sessions from the file
+active_sessions = TTLCache(maxsize=Config.SESSION_CACHE_SIZE, ttl=Config.SESSION_TTL)
 batch_jobs = {}  # Store batch processing jobs
 active_datasets = {}  # Store dataset information
 uploaded_files = {}  # Store uploaded file information
+# Content-addressed uploads being processed, by job id; identical uploads wait on these
+pending_uploads: Dict[str, asyncio.Future] = {}
 
 # Thread pool for parallel processing
 executor = ThreadPoolExecutor(max_workers=4)
 
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Uploads written since startup, oldest first: (created time, job id, upload path).
+# Periodic cleanup pops expired entries; only the startup cleanup scans directories
+upload_manifest: deque = deque()
+
+# Tileset managers by username; each holds a pooled HTTP session
+tileset_managers: Dict[str, MapboxTilesetManager] = {}
+
+# Cached Mapbox tileset listing for the main page
+_tileset_cache = {"ts": 0.0, "data": None}
+
+# Per-tileset Mapbox lookups (format checks, ready status), keyed by (kind, username, tileset_id)
+tileset_info_cache = TTLCache(maxsize=1024, ttl=Config.TILESET_CACHE_TTL)
+
+# Tileset creation jobs, drained by TILESET_WORKERS workers started at startup
+tileset_queue: asyncio.Queue = asyncio.Queue()
+tileset_workers: List[asyncio.Task] = []
+# Job ids waiting in tileset_queue, in queue order, for reporting queue_position
+queued_tileset_jobs: List[str] = []
+
+# Shared visualization store, connected at startup when REDIS_URL is set
+redis_client = None
+# Pending Redis writes; held here so they aren't garbage-collected mid-flight
+share_tasks: set = set()
+VIZ_INDEX_KEY = "viz:index"  # Sorted set of job ids scored by creation time
+ACTIVE_LIST_LIMIT = 100
+
+# Stamped on each visualization change; backs the status ETag
+viz_versions = itertools.count(1)
+
+# Last nanosecond tick used by new_job_id; the lock covers executor threads
+_last_job_ns = [0]
+_job_id_lock = threading.Lock()
+
+# Last rendered main page, keyed by a hash of its tileset list
+_main_page_cache = {"key": None, "body": b""}
+
+# Serialized /api/active-visualizations entries, keyed by each visualization's _version
+_viz_listing_cache = {"key": None, "single": None, "batched": None}
+
+# Background cleanup runs this often (seconds)
+CLEANUP_INTERVAL = 3600
+cleanup_task: Optional[asyncio.Task] = None
+
+# Saved recipes, keyed by tileset id
+saved_recipes: Dict[str, Dict] = {}
+_recipe_dir_state = {"mtime_ns": 0}  # Recipe directory mtime when saved_recipes was loaded
+
+# Characters not allowed in stored filenames / tileset ids
+UNSAFE_FILENAME_RE = re.compile(r'[^A-Za-z0-9._-]')
+UNSAFE_ID_RE = re.compile(r'[^a-z0-9_-]')
+REPEATED_UNDERSCORE_RE = re.compile(r'_+')
+
 # Default weather tileset
 DEFAULT_TILESET = {
     "id": "mapbox.gfs-winds",
@@ -147,6 +251,24 @@ DEFAULT_TILESET = {
     "format": "raster-array"
 }
 
+# Keywords that mark a user tileset as weather-related
+TILESET_KEYWORDS_RE = re.compile(r'weather|netcdf|wx_|wind|flow|raster', re.IGNORECASE)
+DATASET_KEYWORDS_RE = re.compile(r'weather|netcdf|wind|temperature|pressure', re.IGNORECASE)
+
+# Common exact names, checked before falling back to the regexes
+U_WIND_NAMES = frozenset({'u', 'u10', 'ugrd', 'uas', 'uwnd', 'u_wind', 'uwind'})
+V_WIND_NAMES = frozenset({'v', 'v10', 'vgrd', 'vas', 'vwnd', 'v_wind', 'vwind'})
+
+# Spatial chunk edge for Zarr copies, matching Mapbox's 256px tiles
+ZARR_TILE_SIZE = 256
+
+# Variables larger than this are subsampled for preview stats
+PREVIEW_MAX_CELLS = 5_000_000
+
+# Coordinate names checked, in order, for latitude / longitude
+LAT_COORD_NAMES = ('lat', 'latitude', 'y', 'Y')
+LON_COORD_NAMES = ('lon', 'longitude', 'x', 'X')
+
 # File management database (in-memory for now, can be replaced with a real database)
 def load_file_database():
     """Load file information from uploads directory"""
@@ -197,18 +319,38 @@ async def startup_event():
     logger.info(f"Mapbox Token Set: {'Yes' if Config.MAPBOX_TOKEN else 'No'}")
     logger.info(f"Mapbox Public Token Set: {'Yes' if Config.MAPBOX_PUBLIC_TOKEN else 'No'}")
     logger.info(f"Max Batch Size: {Config.MAX_BATCH_SIZE}")
+    logger.info(f"Worker PID: {os.getpid()}")
+    
+    # Share visualization state between workers
+    if Config.REDIS_URL:
+        global redis_client
+        try:
+            import redis.asyncio as aioredis
+            redis_client = aioredis.from_url(Config.REDIS_URL)
+            await redis_client.ping()
+            logger.info("Sharing visualization state through Redis")
+        except Exception as e:
+            logger.error(f"Redis unavailable, keeping visualization state in-process: {e}")
+            redis_client = None
     
     # Load file database
     load_file_database()
+    load_recipes()
     
-    # Run cleanup
-    await cleanup_old_files()
+    # Reconcile leftovers from earlier runs now, then clean up periodically
+    await cleanup_old_files(full_scan=True)
+    global cleanup_task
+    cleanup_task = asyncio.create_task(periodic_cleanup())
+    
+    # Start tileset creation workers
+    for _ in range(Config.TILESET_WORKERS):
+        tileset_workers.append(asyncio.create_task(tileset_worker()))
     
     # Test Mapbox connection
     if Config.MAPBOX_TOKEN and Config.MAPBOX_USERNAME:
         try:
-            manager = MapboxTilesetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
-            tilesets = manager.list_tilesets(limit=1)
+            manager = get_tileset_manager()
+            tilesets = await asyncio.to_thread(manager.list_tilesets, limit=1)
             logger.info(f"Mapbox connection successful. Found {len(tilesets)} tilesets.")
             
         except Exception as e:
@@ -226,16 +368,15 @@ async def main_page(request: Request):
     # Add user's uploaded tilesets
     if Config.MAPBOX_TOKEN and Config.MAPBOX_USERNAME:
         try:
-            manager = MapboxTilesetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
-            user_tilesets = manager.list_tilesets(limit=50)
+            user_tilesets = await asyncio.to_thread(list_user_tilesets)
+            refresh_recipes()
             
             for ts in user_tilesets:
                 # Include weather-related tilesets
-                tileset_name = ts.get('name', '').lower()
+                tileset_name = ts.get('name', '')
                 tileset_id = ts.get('id', '')
                 
-                if any(keyword in tileset_name or keyword in tileset_id.lower() 
-                      for keyword in ['weather', 'netcdf', 'wx_', 'wind', 'flow', 'raster']):
+                if TILESET_KEYWORDS_RE.search(tileset_name) or TILESET_KEYWORDS_RE.search(tileset_id):
                     
                     tileset_info = {
                         "id": ts['id'],
@@ -247,23 +388,18 @@ async def main_page(request: Request):
                     
                     # Check if we have recipe info
                     tileset_short_id = tileset_id.split('.')[-1] if '.' in tileset_id else tileset_id
-                    recipe_files = list(Config.RECIPE_DIR.glob(f"*{tileset_short_id}*.json"))
+                    recipe_data = find_recipe(saved_recipes, tileset_short_id)
                     
-                    if recipe_files:
-                        try:
-                            with open(recipe_files[0], 'r') as f:
-                                recipe_data = json.load(f)
-                                tileset_info['format'] = recipe_data.get('actual_format', recipe_data.get('format', 'vector'))
-                                tileset_info['source_layer'] = recipe_data.get('source_layer')
-                                tileset_info['session_id'] = recipe_data.get('session_id')
-                                tileset_info['requested_format'] = recipe_data.get('requested_format', 'vector')
-                                tileset_info['use_client_animation'] = recipe_data.get('use_client_animation', False)
-                                tileset_info['bounds'] = recipe_data.get('bounds')
-                                tileset_info['center'] = recipe_data.get('center')
-                                tileset_info['zoom'] = recipe_data.get('zoom')
-                                tileset_info['batch_id'] = recipe_data.get('batch_id')  # Add batch info
-                        except:
-                            tileset_info['format'] = 'vector'
+                    if recipe_data is not None:
+                        tileset_info['format'] = recipe_data.get('actual_format', recipe_data.get('format', 'vector'))
+                        tileset_info['source_layer'] = recipe_data.get('source_layer')
+                        tileset_info['session_id'] = recipe_data.get('session_id')
+                        tileset_info['requested_format'] = recipe_data.get('requested_format', 'vector')
+                        tileset_info['use_client_animation'] = recipe_data.get('use_client_animation', False)
+                        tileset_info['bounds'] = recipe_data.get('bounds')
+                        tileset_info['center'] = recipe_data.get('center')
+                        tileset_info['zoom'] = recipe_data.get('zoom')
+                        tileset_info['batch_id'] = recipe_data.get('batch_id')  # Add batch info
                     else:
                         # Check if it's a raster tileset
                         if 'raster' in ts.get('type', '').lower():
@@ -278,7 +414,12 @@ async def main_page(request: Request):
     
     logger.info(f"Available tilesets: {len(available_tilesets)}")
     
-    return templates.TemplateResponse("main_weather_map.html", {
+    # The page only varies with the tileset list, so reuse the last render
+    cache_key = hashlib.blake2b(orjson.dumps(available_tilesets), digest_size=8).digest()
+    if _main_page_cache["key"] == cache_key:
+        return HTMLResponse(_main_page_cache["body"])
+    
+    response = templates.TemplateResponse("main_weather_map.html", {
         "request": request,
         "mapbox_token": Config.MAPBOX_PUBLIC_TOKEN,
         "mapbox_username": Config.MAPBOX_USERNAME,
@@ -286,6 +427,87 @@ async def main_page(request: Request):
         "default_tileset": DEFAULT_TILESET,
         "max_batch_size": Config.MAX_BATCH_SIZE
     })
+    _main_page_cache["key"] = cache_key
+    _main_page_cache["body"] = response.body
+    
+    return response
+
+def get_tileset_manager(username: Optional[str] = None) -> MapboxTilesetManager:
+    """Shared MapboxTilesetManager per username, so its HTTP session is reused"""
+    username = username or Config.MAPBOX_USERNAME
+    manager = tileset_managers.get(username)
+    if manager is None:
+        manager = tileset_managers[username] = MapboxTilesetManager(Config.MAPBOX_TOKEN, username)
+    return manager
+
+def list_user_tilesets() -> List[Dict]:
+    """List the user's Mapbox tilesets, reusing the result for TILESET_CACHE_TTL seconds"""
+    now = time.monotonic()
+    if _tileset_cache["data"] is not None and now - _tileset_cache["ts"] < Config.TILESET_CACHE_TTL:
+        return _tileset_cache["data"]
+    
+    manager = get_tileset_manager()
+    tilesets = manager.list_tilesets(limit=50)
+    
+    # Empty results are also what API errors return, so don't cache them
+    if tilesets:
+        _tileset_cache["data"] = tilesets
+        _tileset_cache["ts"] = now
+    
+    return tilesets
+
+def invalidate_tileset_cache():
+    """Force the next list_user_tilesets call to hit Mapbox"""
+    _tileset_cache["data"] = None
+    _tileset_cache["ts"] = 0.0
+    tileset_info_cache.clear()
+
+def get_recipe_key(filename: str) -> str:
+    """Tileset id a recipe file belongs to (recipe_<tileset_id>.json)"""
+    recipe_key = filename[:-len('.json')] if filename.endswith('.json') else filename
+    if recipe_key.startswith('recipe_'):
+        recipe_key = recipe_key[len('recipe_'):]
+    return recipe_key
+
+def load_recipes():
+    """Parse every saved recipe into saved_recipes in one directory pass"""
+    saved_recipes.clear()
+    _recipe_dir_state["mtime_ns"] = os.stat(Config.RECIPE_DIR_STR).st_mtime_ns
+    
+    with os.scandir(Config.RECIPE_DIR_STR) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+            
+            try:
+                with open(entry.path, 'rb') as f:
+                    saved_recipes[get_recipe_key(entry.name)] = orjson.loads(f.read())
+            except Exception as e:
+                logger.error(f"Error reading recipe {entry.path}: {e}")
+    
+    logger.info(f"Loaded {len(saved_recipes)} recipes")
+
+def refresh_recipes():
+    """Reload recipes if files were added or removed outside the app"""
+    try:
+        if os.stat(Config.RECIPE_DIR_STR).st_mtime_ns != _recipe_dir_state["mtime_ns"]:
+            load_recipes()
+    except OSError as e:
+        logger.error(f"Error checking recipe directory: {e}")
+
+def forget_recipes(file_id: str):
+    """Drop cached recipes whose tileset id contains file_id"""
+    for recipe_key in [key for key in saved_recipes if file_id in key]:
+        del saved_recipes[recipe_key]
+
+def find_recipe(recipes: Dict[str, Any], tileset_short_id: str) -> Optional[Any]:
+    """Look up a recipe by tileset id, falling back to a substring match"""
+    recipe_data = recipes.get(tileset_short_id)
+    if recipe_data is None:
+        recipe_data = next(
+            (data for key, data in recipes.items() if tileset_short_id in key), None
+        )
+    return recipe_data
 
 # File Management API Endpoints
 @app.get("/api/files")
@@ -367,6 +589,8 @@ async def delete_file(file_id: str):
         # Remove from active visualizations
         if file_id in active_visualizations:
             del active_visualizations[file_id]
+        await drop_shared_visualization(file_id)
+        remove_zarr_copy(file_id)
         
         # Remove from active sessions
         if file_id in active_sessions:
@@ -380,6 +604,7 @@ async def delete_file(file_id: str):
                 logger.info(f"Deleted recipe: {recipe_file}")
             except Exception as e:
                 logger.error(f"Error deleting recipe: {e}")
+        forget_recipes(file_id)
         
         # Remove from uploaded files
         del uploaded_files[file_id]
@@ -429,8 +654,7 @@ async def reprocess_file(
         
         if Config.MAPBOX_TOKEN and Config.MAPBOX_USERNAME:
             # Start background tileset creation
-            background_tasks.add_task(
-                create_mapbox_tileset_background,
+            enqueue_tileset(
                 file_path,
                 file_id,
                 result.get('tileset_id'),
@@ -444,7 +668,8 @@ async def reprocess_file(
         uploaded_files[file_id]['processing_status'] = 'processing'
         uploaded_files[file_id]['metadata'] = result.get('metadata')
         
-        return result
+        # ORJSONResponse serializes the numpy wind arrays directly
+        return ORJSONResponse(result)
         
     except Exception as e:
         logger.error(f"Error reprocessing file {file_id}: {e}")
@@ -452,22 +677,45 @@ async def reprocess_file(
 
 @app.get("/api/file/{file_id}/download")
 async def download_file(file_id: str):
-    """Download the original NetCDF file"""
-    if file_id not in uploaded_files:
+    """Download the original NetCDF file (sent with sendfile)"""
+    file_info = uploaded_files.get(file_id)
+    if file_info is not None:
+        file_path = file_info['file_path']
+        filename = file_info['original_filename']
+    elif file_id in active_visualizations:
+        # Jobs that never reached the file database (e.g. failed uploads) are still tracked here
+        file_path = active_visualizations[file_id]['file_path']
+        filename = os.path.basename(file_path).removeprefix(f"{file_id}_")
+    else:
         raise HTTPException(404, "File not found")
     
-    file_info = uploaded_files[file_id]
-    file_path = Path(file_info['file_path'])
-    
-    if not file_path.exists():
+    if not os.path.exists(file_path):
         raise HTTPException(404, "File no longer exists on disk")
     
     return FileResponse(
         path=str(file_path),
-        filename=file_info['original_filename'],
+        filename=filename,
         media_type='application/x-netcdf'
     )
 
+@app.get("/api/recipe/{tileset_id}/download")
+async def download_recipe(tileset_id: str):
+    """Download the saved recipe for a tileset"""
+    # Only serve recipes we know about, never arbitrary paths
+    if tileset_id not in saved_recipes:
+        raise HTTPException(404, "Recipe not found")
+    
+    recipe_name = f"recipe_{tileset_id}.json"
+    recipe_path = os.path.join(Config.RECIPE_DIR_STR, recipe_name)
+    if not os.path.exists(recipe_path):
+        raise HTTPException(404, "Recipe no longer exists on disk")
+    
+    return FileResponse(
+        path=recipe_path,
+        filename=recipe_name,
+        media_type='application/json'
+    )
+
 @app.post("/api/files/delete-batch")
 async def delete_files_batch(file_ids: List[str]):
     """Delete multiple files at once"""
@@ -488,6 +736,8 @@ async def delete_files_batch(file_ids: List[str]):
                 # Clean up associated data
                 if file_id in active_visualizations:
                     del active_visualizations[file_id]
+                await drop_shared_visualization(file_id)
+                remove_zarr_copy(file_id)
                 if file_id in active_sessions:
                     del active_sessions[file_id]
                 
@@ -498,6 +748,7 @@ async def delete_files_batch(file_ids: List[str]):
                         recipe_file.unlink()
                     except:
                         pass
+                forget_recipes(file_id)
                 
                 del uploaded_files[file_id]
                 deleted.append(file_id)
@@ -514,6 +765,50 @@ async def delete_files_batch(file_ids: List[str]):
         "message": f"Deleted {len(deleted)} files, {len(errors)} errors"
     }
 
+def new_job_id() -> str:
+    """Short, time-ordered id from the nanosecond clock (13 base32 chars)"""
+    # Never hand out the same tick twice, even on a coarse clock
+    with _job_id_lock:
+        now_ns = max(time.time_ns(), _last_job_ns[0] + 1)
+        _last_job_ns[0] = now_ns
+    # base32hex's alphabet (0-9, a-v) sorts in value order, so ids sort by time
+    return base64.b32hexencode(now_ns.to_bytes(8, 'big')).rstrip(b'=').decode().lower()
+
+def get_upload_path(job_id: str, filename: str) -> Path:
+    """Build the on-disk path for an upload from its job id and a sanitized filename"""
+    safe_filename = UNSAFE_FILENAME_RE.sub('_', Path(filename).name)
+    if not safe_filename.endswith('.nc'):
+        safe_filename = safe_filename.rsplit('.', 1)[0] + '.nc'
+    
+    file_path = Config.UPLOAD_DIR / f"{job_id}_{safe_filename}"
+    upload_manifest.append((time.time(), job_id, str(file_path)))
+    return file_path
+
+def copy_upload(file: UploadFile, file_path: Path, hasher=None) -> int:
+    """Copy an upload's spooled body to disk, enforcing MAX_FILE_SIZE; returns bytes written"""
+    file_size = 0
+    
+    try:
+        file.file.seek(0)
+        with open(file_path, 'wb', buffering=UPLOAD_CHUNK_SIZE) as f:
+            while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > Config.MAX_FILE_SIZE:
+                    raise HTTPException(413, f"File {file.filename} too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB")
+                if hasher is not None:
+                    hasher.update(chunk)
+                f.write(chunk)
+    except Exception:
+        # Don't leave partial uploads behind
+        file_path.unlink(missing_ok=True)
+        raise
+    
+    return file_size
+
+async def save_upload_file(file: UploadFile, file_path: Path, hasher=None) -> int:
+    """Save an upload to disk on a worker thread; returns bytes written"""
+    return await asyncio.to_thread(copy_upload, file, file_path, hasher)
+
 # Existing endpoints remain the same...
 @app.post("/api/upload-netcdf")
 async def upload_netcdf(
@@ -521,7 +816,8 @@ async def upload_netcdf(
     file: UploadFile = File(...),
     create_tileset: bool = Form(True),
     tileset_name: Optional[str] = Form(None),
-    visualization_type: str = Form("vector")
+    visualization_type: str = Form("vector"),
+    include_wind_data: bool = Form(False)
 ):
     """Upload and process single NetCDF file (backward compatibility)"""
     
@@ -529,50 +825,89 @@ async def upload_netcdf(
     if not file.filename.endswith('.nc'):
         raise HTTPException(400, "Only NetCDF (.nc) files are allowed")
     
-    # Check file size
-    content = await file.read()
-    file_size = len(content)
-    
-    if file_size > Config.MAX_FILE_SIZE:
-        raise HTTPException(400, f"File too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB")
+    # Stream file to disk, deriving the job id from its content and the
+    # processing options, so only an identical request maps to the same job
+    temp_path = Config.UPLOAD_DIR / f".upload_{uuid.uuid4().hex}.part"
+    hasher = hashlib.blake2b(digest_size=8)
+    file_size = await save_upload_file(file, temp_path, hasher)
+    # Every option that changes the result is part of the key; orjson keeps the
+    # fields unambiguous even when a name contains the separator
+    hasher.update(orjson.dumps([visualization_type, create_tileset, tileset_name]))
+    job_id = hasher.hexdigest()
+    
+    # Identical request still processing - wait for it rather than running it twice
+    pending = pending_uploads.get(job_id)
+    if pending is not None:
+        logger.info(f"Waiting for in-flight upload {job_id} for {file.filename}")
+        await asyncio.shield(pending)
+    
+    # Identical request already processed - reuse it
+    existing = active_visualizations.get(job_id)
+    if existing and existing.get('status') != 'failed':
+        temp_path.unlink(missing_ok=True)
+        logger.info(f"Reusing processed upload {job_id} for {file.filename}")
+        return ORJSONResponse({
+            "filename": file.filename,
+            "success": True,
+            "duplicate": True,
+            **summarize_visualization(job_id, existing),
+            "wind_data": active_sessions.get(job_id, {}).get('wind_data') if include_wind_data else None
+        })
     
-    # Create job
-    job_id = datetime.now().strftime("%Y%m%d%H%M%S")
-    
-    # Process single file using the same logic as batch with one file
-    files = [{"file": file, "content": content}]
-    result = await process_batch_upload(
-        files=files,
-        job_ids=[job_id],
-        create_tileset=create_tileset,
-        tileset_names=[tileset_name] if tileset_name else None,
-        visualization_type=visualization_type,
-        background_tasks=background_tasks
-    )
+    # A failed run, or a file database entry from an earlier run, keeps its
+    # id and files; process this upload under a fresh id instead
+    content_addressed = not (existing or job_id in uploaded_files)
+    if content_addressed:
+        # Claimed before the next await, so concurrent duplicates see it
+        pending = asyncio.get_running_loop().create_future()
+        pending_uploads[job_id] = pending
+    else:
+        job_id = new_job_id()
     
-    # Update file database
-    if result['files']:
-        file_result = result['files'][0]
-        if file_result.get('success'):
-            uploaded_files[job_id] = {
-                "id": job_id,
-                "filename": f"{job_id}_{file.filename}",
-                "original_filename": file.filename,
-                "size": file_size,
-                "upload_date": datetime.now().isoformat(),
-                "status": "active",
-                "metadata": file_result.get('metadata'),
-                "tileset_id": file_result.get('tileset_id'),
-                "job_id": job_id,
-                "processing_status": file_result.get('status', 'processing'),
-                "file_path": str(Config.UPLOAD_DIR / f"{job_id}_{file.filename}")
-            }
+    try:
+        file_path = get_upload_path(job_id, file.filename)
+        temp_path.replace(file_path)
+        logger.info(f"Saved uploaded file: {file_path}")
+        
+        # Process single file using the same logic as batch with one file
+        files = [{"file": file, "file_path": file_path, "size": file_size,
+                  "content_addressed": content_addressed}]
+        result = await process_batch_upload(
+            files=files,
+            job_ids=[job_id],
+            create_tileset=create_tileset,
+            tileset_names=[tileset_name] if tileset_name else None,
+            visualization_type=visualization_type,
+            background_tasks=background_tasks
+        )
+        
+        # Update file database
+        if result['files']:
+            file_result = result['files'][0]
+            if file_result.get('success'):
+                uploaded_files[job_id] = {
+                    "id": job_id,
+                    "filename": file_path.name,
+                    "original_filename": file.filename,
+                    "size": file_size,
+                    "upload_date": datetime.now().isoformat(),
+                    "status": "active",
+                    "metadata": file_result.get('metadata'),
+                    "tileset_id": file_result.get('tileset_id'),
+                    "job_id": job_id,
+                    "processing_status": file_result.get('status', 'processing'),
+                    "file_path": str(file_path)
+                }
+    finally:
+        if content_addressed:
+            pending_uploads.pop(job_id, None)
+            pending.set_result(None)
     
-    # Return single file result
+    # Return single file result; wind data stays in the session unless asked for
     if result['files']:
-        return JSONResponse(result['files'][0])
+        return ORJSONResponse(with_wind_data(result['files'], include_wind_data)[0])
     else:
-        return JSONResponse({
+        return ORJSONResponse({
             "success": False,
             "error": "Failed to process file"
         }, status_code=500)
@@ -584,7 +919,8 @@ async def upload_netcdf_batch(
     create_tileset: bool = Form(True),
     tileset_names: Optional[str] = Form(None),  # Comma-separated names
     visualization_type: str = Form("vector"),
-    merge_files: bool = Form(False)  # Option to merge files into single tileset
+    merge_files: bool = Form(False),  # Option to merge files into single tileset
+    include_wind_data: bool = Form(False)
 ):
     """Upload and process multiple NetCDF files"""
     
@@ -607,20 +943,24 @@ async def upload_netcdf_batch(
         if len(tileset_name_list) != len(files):
             tileset_name_list = None  # Ignore if count doesn't match
     
-    # Read all files
+    # Stream all files to disk
     file_contents = []
     job_ids = []
     
     for i, file in enumerate(files):
-        content = await file.read()
+        job_id = f"{batch_id}_{i}_{new_job_id()}"
+        file_path = get_upload_path(job_id, file.filename)
         
-        # Check individual file size
-        if len(content) > Config.MAX_FILE_SIZE:
-            raise HTTPException(400, f"File {file.filename} too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB")
+        try:
+            file_size = await save_upload_file(file, file_path)
+        except Exception:
+            # Drop files already saved for this batch
+            for saved in file_contents:
+                saved['file_path'].unlink(missing_ok=True)
+            raise
         
-        job_id = f"{batch_id}_{i}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
         job_ids.append(job_id)
-        file_contents.append({"file": file, "content": content})
+        file_contents.append({"file": file, "file_path": file_path, "size": file_size})
     
     # Initialize batch job
     batch_jobs[batch_id] = {
@@ -662,26 +1002,37 @@ async def upload_netcdf_batch(
     batch_jobs[batch_id].update(result)
     
     # Update file database for each file
+    upload_date = datetime.now().isoformat()
     for i, file_result in enumerate(result.get('files', [])):
         if file_result.get('success'):
             job_id = job_ids[i]
             file = files[i]
             uploaded_files[job_id] = {
                 "id": job_id,
-                "filename": f"{job_id}_{file.filename}",
+                "filename": file_contents[i]['file_path'].name,
                 "original_filename": file.filename,
-                "size": len(file_contents[i]['content']),
-                "upload_date": datetime.now().isoformat(),
+                "size": file_contents[i]['size'],
+                "upload_date": upload_date,
                 "status": "active",
                 "metadata": file_result.get('metadata'),
                 "tileset_id": file_result.get('tileset_id'),
                 "job_id": job_id,
                 "processing_status": file_result.get('status', 'processing'),
                 "batch_id": batch_id,
-                "file_path": str(Config.UPLOAD_DIR / f"{job_id}_{file.filename}")
+                "file_path": str(file_contents[i]['file_path'])
             }
     
-    return JSONResponse(result)
+    # Wind data stays in the sessions unless asked for
+    return ORJSONResponse({**result, "files": with_wind_data(result['files'], include_wind_data)})
+
+def with_wind_data(file_results: List[Dict], include_wind_data: bool) -> List[Dict]:
+    """Upload results for a response, with each file's session wind grids attached if requested"""
+    if not include_wind_data:
+        return file_results
+    return [
+        {**file_result, "wind_data": active_sessions.get(file_result['job_id'], {}).get('wind_data')}
+        for file_result in file_results
+    ]
 
 async def process_batch_upload(
     files: List[Dict],
@@ -703,50 +1054,40 @@ async def process_batch_upload(
         "errors": []
     }
     
+    created_at = datetime.now().isoformat()
+    
     # Process each file
     for i, file_data in enumerate(files):
         file = file_data['file']
-        content = file_data['content']
+        file_path = file_data['file_path']
         job_id = job_ids[i]
         tileset_name = tileset_names[i] if tileset_names and i < len(tileset_names) else None
         
         try:
-            # Sanitize filename
-            safe_filename = Path(file.filename).name
-            safe_filename = ''.join(c if c.isalnum() or c in '.-_' else '_' for c in safe_filename)
-            if not safe_filename.endswith('.nc'):
-                safe_filename = safe_filename.rsplit('.', 1)[0] + '.nc'
-            
-            # Save uploaded file
-            file_path = Config.UPLOAD_DIR / f"{job_id}_{safe_filename}"
-            
-            logger.info(f"Saving uploaded file: {file_path}")
-            
-            async with aiofiles.open(str(file_path), 'wb') as f:
-                await f.write(content)
-            
             # Process file
             result = await process_netcdf_file(
-                file_path, job_id, create_tileset, tileset_name, visualization_type, batch_id
+                file_path, job_id, create_tileset, tileset_name, visualization_type, batch_id,
+                persist_summary=file_data.get('content_addressed', False)
             )
             
-            # Store session data for client-side animation
-            if result.get('wind_data'):
+            # Store session data for client-side animation; the grids live only
+            # in the session, so results (kept in batch_jobs) stay metadata
+            wind_data = result.pop('wind_data', None)
+            if wind_data:
                 active_sessions[job_id] = {
                     'file_path': str(file_path),
-                    'wind_data': result['wind_data'],
+                    'wind_data': wind_data,
                     'bounds': result.get('bounds'),
                     'center': result.get('center'),
                     'zoom': result.get('zoom'),
-                    'created_at': datetime.now().isoformat(),
+                    'created_at': created_at,
                     'batch_id': batch_id
                 }
                 result['session_id'] = job_id
             
             if create_tileset and Config.MAPBOX_TOKEN and Config.MAPBOX_USERNAME:
                 # Start background tileset creation
-                background_tasks.add_task(
-                    create_mapbox_tileset_background,
+                enqueue_tileset(
                     file_path,
                     job_id,
                     result.get('tileset_id'),
@@ -775,7 +1116,7 @@ async def process_batch_upload(
             })
             
             # Clean up file on error
-            if 'file_path' in locals() and file_path.exists():
+            if file_path.exists():
                 try:
                     file_path.unlink()
                 except:
@@ -793,96 +1134,54 @@ async def process_batch_upload(
 
 async def process_netcdf_file(file_path: Path, job_id: str, create_tileset: bool, 
                              tileset_name: Optional[str], visualization_type: str,
-                             batch_id: Optional[str] = None) -> Dict:
+                             batch_id: Optional[str] = None, persist_summary: bool = False) -> Dict:
+    """Process NetCDF file on the worker pool so decoding doesn't block the event loop"""
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(
+        executor, process_netcdf_file_sync,
+        file_path, job_id, create_tileset, tileset_name, visualization_type, batch_id,
+        persist_summary
+    )
+    await share_visualization(job_id)
+    return result
+
+def process_netcdf_file_sync(file_path: Path, job_id: str, create_tileset: bool,
+                             tileset_name: Optional[str], visualization_type: str,
+                             batch_id: Optional[str] = None, persist_summary: bool = False) -> Dict:
     """Process NetCDF file and extract metadata"""
     try:
-        # Convert Path to string for xarray
-        file_path_str = str(file_path)
-        ds = xr.open_dataset(file_path_str)
-        
-        # Log file info
-        logger.info(f"Opened NetCDF file: {file_path}")
-        logger.info(f"Dimensions: {dict(ds.dims)}")
-        logger.info(f"Variables: {list(ds.data_vars)}")
-        logger.info(f"Coordinates: {list(ds.coords)}")
-        
-        # Extract metadata
-        metadata = {
-            "dimensions": dict(ds.dims),
-            "variables": list(ds.data_vars),
-            "coordinates": list(ds.coords),
-            "attributes": dict(ds.attrs)
-        }
-        
-        # Find wind components
-        wind_components = find_wind_components(ds)
-        
-        # Get all scalar variables
-        scalar_vars = []
-        vector_pairs = []
-        
-        if wind_components:
-            logger.info(f"Found wind components: {wind_components}")
-            vector_pairs.append({
-                "name": "wind",
-                "u": wind_components["u"],
-                "v": wind_components["v"]
-            })
-            scalar_vars = [v for v in ds.data_vars if v not in [wind_components["u"], wind_components["v"]]]
-        else:
-            logger.warning("No wind components found in NetCDF file")
-            scalar_vars = list(ds.data_vars)
-        
-        # Get bounds
-        bounds = get_dataset_bounds(ds)
-        if bounds:
-            logger.info(f"Dataset bounds: {bounds}")
-        else:
-            logger.warning("Could not determine dataset bounds")
+        summary = get_netcdf_summary(file_path, job_id, persist_summary)
+        metadata = summary["metadata"]
+        wind_components = summary["wind_components"]
+        scalar_vars = summary["scalar_vars"]
+        vector_pairs = summary["vector_pairs"]
+        bounds = summary["bounds"]
+        previews = summary["previews"]
         
         # Calculate optimal center and zoom for the data region
         center, zoom = calculate_optimal_view(bounds) if bounds else (None, None)
         
-        # Get data previews
-        previews = {}
-        for var_name in list(ds.data_vars)[:5]:  # Preview first 5 variables
-            try:
-                var_data = ds[var_name]
-                if 'time' in var_data.dims:
-                    var_data = var_data.isel(time=0)
-                
-                values = var_data.values.flatten()
-                values = values[~np.isnan(values)]  # Remove NaN values
-                
-                if len(values) > 0:
-                    previews[var_name] = {
-                        "min": float(np.min(values)),
-                        "max": float(np.max(values)),
-                        "mean": float(np.mean(values)),
-                        "units": var_data.attrs.get("units", "unknown")
-                    }
-            except:
-                pass
+        zarr_path = write_zarr_copy(file_path, job_id) if Config.ZARR_CACHE else None
         
         # Extract wind data for client-side animation
         wind_data = None
         if wind_components and visualization_type in ['raster-array', 'client-side']:
-            wind_data = extract_wind_data_for_client(ds, wind_components, bounds)
+            with open_processed_dataset(file_path, zarr_path) as ds:
+                wind_data = extract_wind_data_for_client(ds, wind_components, bounds)
         
         # Generate tileset ID
         if not tileset_name:
             filename = Path(file_path).stem.split('_', 1)[-1]  # Remove job_id prefix
-            tileset_name = ''.join(c for c in filename if c.isalnum() or c in '-_')[:20]
+            tileset_name = UNSAFE_ID_RE.sub('', filename.lower())[:20]
             if not tileset_name:
                 tileset_name = "weather_data"
         
         # Sanitize tileset name
-        tileset_name = tileset_name.lower()
-        tileset_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in tileset_name)
-        tileset_name = '_'.join(part for part in tileset_name.split('_') if part)
+        tileset_name = UNSAFE_ID_RE.sub('_', tileset_name.lower())
+        tileset_name = REPEATED_UNDERSCORE_RE.sub('_', tileset_name).strip('_')
         
         # Create short timestamp
-        timestamp = datetime.now().strftime("%m%d%H%M")
+        timestamp = new_job_id()[-6:]
         prefix = "wx"
         
         # Add batch indicator if part of batch
@@ -895,8 +1194,7 @@ async def process_netcdf_file(file_path: Path, job_id: str, create_tileset: bool
             tileset_name = tileset_name[:max_name_length]
         
         tileset_id = f"{prefix}_{tileset_name}_{timestamp}"
-        tileset_id = tileset_id.lower()
-        tileset_id = ''.join(c for c in tileset_id if c.isalnum() or c in '-_')
+        tileset_id = UNSAFE_ID_RE.sub('', tileset_id.lower())
         tileset_id = tileset_id[:32].rstrip('_')
         
         logger.info(f"Generated tileset_id: {tileset_id}")
@@ -916,12 +1214,12 @@ async def process_netcdf_file(file_path: Path, job_id: str, create_tileset: bool
             "status": "processing",
             "scalar_vars": scalar_vars,
             "vector_pairs": vector_pairs,
+            "zarr_path": zarr_path,
             "session_id": job_id,
-            "batch_id": batch_id
+            "batch_id": batch_id,
+            "_version": next(viz_versions)
         }
         
-        ds.close()
-        
         return {
             "success": True,
             "job_id": job_id,
@@ -955,6 +1253,200 @@ async def process_netcdf_file(file_path: Path, job_id: str, create_tileset: bool
         
         raise Exception(error_msg)
 
+def get_summary_path(job_id: str) -> str:
+    """Location of the persisted NetCDF summary of an upload"""
+    return os.path.join(Config.PROCESSED_DIR_STR, f"{job_id}.summary.json")
+
+def get_netcdf_summary(file_path, job_id: str, persist: bool = False) -> Dict:
+    """NetCDF summary, persisted for content-addressed jobs so identical re-uploads skip xarray"""
+    # Only content-derived job ids can recur, so only their summaries are worth storing
+    summary_path = get_summary_path(job_id)
+    try:
+        with open(summary_path, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable summary {summary_path}: {e}")
+    
+    summary = read_netcdf_summary(str(file_path))
+    if not persist:
+        return summary
+    
+    try:
+        with open(summary_path, 'wb') as f:
+            f.write(orjson.dumps(summary, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS))
+    except Exception as e:
+        logger.warning(f"Could not store summary for {job_id}: {e}")
+        Path(summary_path).unlink(missing_ok=True)
+    
+    return summary
+
+def read_netcdf_summary(file_path: str) -> Dict:
+    """Metadata, wind components, bounds and previews for a NetCDF file"""
+    with open_netcdf_dataset(file_path) as ds:
+        # Log file info
+        logger.info(f"Opened NetCDF file: {file_path}")
+        logger.info(f"Dimensions: {dict(ds.dims)}")
+        logger.info(f"Variables: {list(ds.data_vars)}")
+        logger.info(f"Coordinates: {list(ds.coords)}")
+        
+        # Extract metadata
+        metadata = {
+            "dimensions": dict(ds.dims),
+            "variables": list(ds.data_vars),
+            "coordinates": list(ds.coords),
+            "attributes": dict(ds.attrs)
+        }
+        
+        # Find wind components
+        wind_components = find_wind_components(ds)
+        
+        # Get all scalar variables
+        scalar_vars = []
+        vector_pairs = []
+        
+        if wind_components:
+            logger.info(f"Found wind components: {wind_components}")
+            vector_pairs.append({
+                "name": "wind",
+                "u": wind_components["u"],
+                "v": wind_components["v"]
+            })
+            scalar_vars = [v for v in ds.data_vars if v not in [wind_components["u"], wind_components["v"]]]
+        else:
+            logger.warning("No wind components found in NetCDF file")
+            scalar_vars = list(ds.data_vars)
+        
+        # Get bounds
+        bounds = get_dataset_bounds(ds)
+        if bounds:
+            logger.info(f"Dataset bounds: {bounds}")
+        else:
+            logger.warning("Could not determine dataset bounds")
+        
+        # Get data previews
+        previews = compute_previews(ds, list(ds.data_vars)[:5])  # Preview first 5 variables
+        
+        return {
+            "metadata": metadata,
+            "wind_components": wind_components,
+            "scalar_vars": scalar_vars,
+            "vector_pairs": vector_pairs,
+            "bounds": bounds,
+            "previews": previews
+        }
+
+def compute_previews(ds: xr.Dataset, var_names: List[str]) -> Dict:
+    """Min/max/mean/units per variable, evaluated together in one dask graph"""
+    preview_vars = []
+    lazy_stats = []
+    for var_name in var_names:
+        var_data = ds[var_name]
+        if 'time' in var_data.dims:
+            var_data = var_data.isel(time=0)
+        if var_data.size == 0 or not np.issubdtype(var_data.dtype, np.number):
+            continue
+        
+        # Previews are indicative, so large grids are sampled on a regular stride
+        if var_data.size > PREVIEW_MAX_CELLS and var_data.ndim >= 2:
+            stride = int(np.ceil(np.sqrt(var_data.size / PREVIEW_MAX_CELLS)))
+            var_data = var_data.isel({dim: slice(None, None, stride) for dim in var_data.dims[-2:]})
+        
+        # float32 is ample for display stats and halves the bytes reduced;
+        # float16 would overflow on values like pressure in Pa
+        if var_data.dtype == np.float64:
+            var_data = var_data.astype(np.float32)
+        
+        preview_vars.append((var_name, var_data.attrs.get("units", "unknown")))
+        lazy_stats.append((var_data.min(), var_data.max(), var_data.mean()))
+    
+    # One compute so each chunk is read once for all reductions;
+    # an all-NaN variable gives a NaN minimum and is skipped
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        try:
+            stats = dask.compute(*lazy_stats)
+        except Exception as e:
+            # One unreadable variable shouldn't cost the others their previews
+            logger.warning(f"Batched preview compute failed, retrying per variable: {e}")
+            stats = []
+            for (var_name, _), var_stats in zip(preview_vars, lazy_stats):
+                try:
+                    stats.append(dask.compute(*var_stats))
+                except Exception as e:
+                    logger.warning(f"Could not compute preview for {var_name}: {e}")
+                    stats.append(None)
+    
+    previews = {}
+    for (var_name, units), var_stats in zip(preview_vars, stats):
+        if var_stats is None:
+            continue
+        min_value, max_value, mean_value = (float(value) for value in var_stats)
+        if not np.isnan(min_value):
+            previews[var_name] = {
+                "min": min_value,
+                "max": max_value,
+                "mean": mean_value,
+                "units": units
+            }
+    
+    return previews
+
+def open_netcdf_dataset(file_path) -> xr.Dataset:
+    """Open a NetCDF file lazily; variable data is only read when a value is needed"""
+    # chunks={} gives dask-backed variables using the file's own chunking,
+    # so metadata, bounds and subsampled reads don't pull whole variables
+    path = str(file_path)
+    try:
+        # h5py releases the GIL while reading, so pool workers overlap
+        return xr.open_dataset(path, engine='h5netcdf', chunks={})
+    except (OSError, ValueError) as e:
+        # Classic (netCDF-3) files aren't HDF5; ValueError if h5netcdf isn't installed
+        logger.info(f"Opening {path} with the default engine (h5netcdf: {e})")
+        return xr.open_dataset(path, chunks={})
+
+def get_zarr_path(job_id: str) -> str:
+    """Location of the Zarr copy of an upload"""
+    return os.path.join(Config.PROCESSED_DIR_STR, f"{job_id}.zarr")
+
+def write_zarr_copy(file_path, job_id: str) -> Optional[str]:
+    """Persist an upload as consolidated Zarr so later reads skip HDF5 parsing"""
+    zarr_path = get_zarr_path(job_id)
+    if os.path.isdir(zarr_path):
+        return zarr_path
+    
+    try:
+        with open_netcdf_dataset(file_path) as ds:
+            # Drop NetCDF-specific encodings that Zarr can't take as-is
+            for var in ds.variables.values():
+                var.encoding.clear()
+            ds.chunk(get_tile_chunks(ds)).to_zarr(zarr_path, mode='w', consolidated=True)
+        logger.info(f"Wrote Zarr copy: {zarr_path}")
+        return zarr_path
+    except Exception as e:
+        logger.warning(f"Could not write Zarr copy of {file_path}: {e}")
+        shutil.rmtree(zarr_path, ignore_errors=True)
+        return None
+
+def get_tile_chunks(ds: xr.Dataset) -> Dict[str, int]:
+    """One time step by ZARR_TILE_SIZE x ZARR_TILE_SIZE spatial chunks"""
+    spatial_dims = set(LAT_COORD_NAMES + LON_COORD_NAMES)
+    chunks = {dim: ZARR_TILE_SIZE for dim in ds.dims if dim in spatial_dims}
+    if 'time' in ds.dims:
+        chunks['time'] = 1
+    return chunks
+
+def open_processed_dataset(file_path, zarr_path: Optional[str] = None) -> xr.Dataset:
+    """Open the Zarr copy of an upload when there is one, else the NetCDF file"""
+    if zarr_path and os.path.isdir(zarr_path):
+        return xr.open_zarr(zarr_path, consolidated=True)
+    return open_netcdf_dataset(file_path)
+
+def remove_zarr_copy(job_id: str):
+    """Delete the Zarr copy of an upload, if any"""
+    shutil.rmtree(get_zarr_path(job_id), ignore_errors=True)
+
 def calculate_optimal_view(bounds: Dict) -> tuple:
     """Calculate optimal center point and zoom level for given bounds"""
     if not bounds:
@@ -1006,35 +1498,47 @@ def extract_wind_data_for_client(ds, wind_components, bounds):
             v_var = v_var.isel(time=0)
         
         # Get coordinate arrays
-        lats = ds.lat.values if 'lat' in ds else ds.latitude.values
-        lons = ds.lon.values if 'lon' in ds else ds.longitude.values
+        lat_coord, lon_coord = find_lat_lon(ds)
+        
+        # The grid's last two dims are (y, x) for both 1-D and curvilinear coordinates
+        y_dim, x_dim = u_var.dims[-2:]
         
         # Subsample if data is too large (max 150x150 for performance)
         max_points = 150
-        lat_step = max(1, len(lats) // max_points)
-        lon_step = max(1, len(lons) // max_points)
+        lat_step = max(1, u_var.sizes[y_dim] // max_points)
+        lon_step = max(1, u_var.sizes[x_dim] // max_points)
         
-        lats_sub = lats[::lat_step]
-        lons_sub = lons[::lon_step]
-        u_sub = u_var.values[::lat_step, ::lon_step]
-        v_sub = v_var.values[::lat_step, ::lon_step]
+        # Stride lazily so only the sampled points are read from disk
+        stride = {
+            y_dim: slice(None, None, lat_step),
+            x_dim: slice(None, None, lon_step)
+        }
+        lats_sub = lat_coord.isel(stride, missing_dims='ignore').values
+        lons_sub = lon_coord.isel(stride, missing_dims='ignore').values
+        u_sub = u_var.isel(stride).values
+        v_sub = v_var.isel(stride).values
         
         # Handle NaN values
-        u_sub = np.nan_to_num(u_sub, nan=0.0)
-        v_sub = np.nan_to_num(v_sub, nan=0.0)
+        # In place where possible: the strided arrays above are fresh copies
+        u_sub = np.nan_to_num(u_sub, copy=not u_sub.flags.writeable, nan=0.0)
+        v_sub = np.nan_to_num(v_sub, copy=not v_sub.flags.writeable, nan=0.0)
+        
+        # float32 is plenty for animation and halves the payload
+        u_sub = u_sub.astype(np.float32, copy=False)
+        v_sub = v_sub.astype(np.float32, copy=False)
         
         # Calculate speed
-        speed = np.sqrt(u_sub**2 + v_sub**2)
+        speed = np.hypot(u_sub, v_sub)
         
         return {
             "grid": {
-                "lats": lats_sub.tolist(),
-                "lons": lons_sub.tolist(),
+                "lats": np.ascontiguousarray(lats_sub),
+                "lons": np.ascontiguousarray(lons_sub),
                 "shape": list(u_sub.shape)
             },
-            "u_component": u_sub.tolist(),
-            "v_component": v_sub.tolist(),
-            "speed": speed.tolist(),
+            "u_component": np.ascontiguousarray(u_sub),
+            "v_component": np.ascontiguousarray(v_sub),
+            "speed": speed,
             "metadata": {
                 "units": u_var.attrs.get('units', 'm/s')
             }
@@ -1043,57 +1547,150 @@ def extract_wind_data_for_client(ds, wind_components, bounds):
         logger.error(f"Error extracting wind data for client: {e}")
         return None
 
+def encode_wind_data(wind_data: Dict) -> Dict:
+    """Replace the wind grids with base64 float32 buffers (row-major, grid.shape)"""
+    encoded = dict(wind_data)
+    for key in ("u_component", "v_component", "speed"):
+        values = np.ascontiguousarray(wind_data[key], dtype=np.float32)
+        encoded[key] = base64.b64encode(values.tobytes()).decode('ascii')
+    encoded["encoding"] = "base64-float32"
+    return encoded
+
 def find_wind_components(ds):
     """Find U and V wind components in dataset"""
-    u_patterns = ['u', 'u10', 'u_wind', 'u_component', 'eastward', 'ugrd', 'u-component', 'uas']
-    v_patterns = ['v', 'v10', 'v_wind', 'v_component', 'northward', 'vgrd', 'v-component', 'vas']
-    
     u_var = None
     v_var = None
     
     for var in ds.data_vars:
         var_lower = var.lower()
-        if not u_var and any(p in var_lower for p in u_patterns):
+        if not u_var and (var_lower in U_WIND_NAMES or U_WIND_RE.match(var)):
             u_var = var
-        elif not v_var and any(p in var_lower for p in v_patterns):
+        elif not v_var and (var_lower in V_WIND_NAMES or V_WIND_RE.match(var)):
             v_var = var
+        
+        if u_var and v_var:
+            break
     
     if u_var and v_var:
         return {"u": u_var, "v": v_var}
     return None
 
+def find_lat_lon(ds) -> Tuple[Optional[xr.DataArray], Optional[xr.DataArray]]:
+    """Return the dataset's latitude and longitude variables (None when missing)"""
+    variables = ds.variables
+    lat_name = next((name for name in LAT_COORD_NAMES if name in variables), None)
+    lon_name = next((name for name in LON_COORD_NAMES if name in variables), None)
+    return (ds[lat_name] if lat_name else None,
+            ds[lon_name] if lon_name else None)
+
 def get_dataset_bounds(ds):
     """Extract geographic bounds from dataset"""
     try:
-        # Find lat/lon coordinates
-        lat_names = ['lat', 'latitude', 'y', 'Y']
-        lon_names = ['lon', 'longitude', 'x', 'X']
-        
-        lat_coord = None
-        lon_coord = None
-        
-        for name in lat_names:
-            if name in ds.coords:
-                lat_coord = ds.coords[name]
-                break
-                
-        for name in lon_names:
-            if name in ds.coords:
-                lon_coord = ds.coords[name]
-                break
-        
+        lat_coord, lon_coord = find_lat_lon(ds)
         if lat_coord is not None and lon_coord is not None:
+            south, north = coordinate_range(ds, lat_coord)
+            west, east = coordinate_range(ds, lon_coord)
             return {
-                "north": float(lat_coord.max()),
-                "south": float(lat_coord.min()),
-                "east": float(lon_coord.max()),
-                "west": float(lon_coord.min())
+                "north": north,
+                "south": south,
+                "east": east,
+                "west": west
             }
     except:
         pass
-    
+
     return None
 
+def coordinate_range(ds, coord) -> Tuple[float, float]:
+    """Return (min, max) of a coordinate without a full reduction for 1-D axes"""
+    # Dimension coordinates are already indexed, so monotonic ones are bounded by their endpoints
+    index = ds.indexes.get(coord.name) if coord.ndim == 1 else None
+    if index is not None and (index.is_monotonic_increasing or index.is_monotonic_decreasing):
+        first, last = float(index[0]), float(index[-1])
+        return min(first, last), max(first, last)
+
+    # Curvilinear (2-D), unindexed or wrapped axes need the full scan
+    return float(coord.min()), float(coord.max())
+
+def update_visualization(job_id: str, **fields):
+    """Apply fields to a tracked visualization and bump its version"""
+    viz_info = active_visualizations.get(job_id)
+    if viz_info is None:
+        return
+    viz_info.update(fields)
+    viz_info['_version'] = next(viz_versions)
+    if redis_client:
+        task = asyncio.get_running_loop().create_task(share_visualization(job_id))
+        share_tasks.add(task)
+        task.add_done_callback(share_tasks.discard)
+
+async def share_visualization(job_id: str):
+    """Mirror a visualization to Redis so other workers can serve it"""
+    viz_info = active_visualizations.get(job_id)
+    if not redis_client or viz_info is None:
+        return
+    try:
+        now = time.time()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.set(
+                f"viz:{job_id}",
+                orjson.dumps(viz_info, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+                ex=Config.REDIS_STATE_TTL
+            )
+            # Index by first-seen time; entries whose record has expired are trimmed
+            pipe.zadd(VIZ_INDEX_KEY, {job_id: now}, nx=True)
+            pipe.zremrangebyscore(VIZ_INDEX_KEY, 0, now - Config.REDIS_STATE_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to share visualization {job_id}: {e}")
+
+async def get_shared_visualization(job_id: str) -> Optional[Dict]:
+    """Visualization tracked by this worker, or by another one through Redis"""
+    viz_info = active_visualizations.get(job_id)
+    if viz_info is not None or not redis_client:
+        return viz_info
+    try:
+        data = await redis_client.get(f"viz:{job_id}")
+    except Exception as e:
+        logger.error(f"Failed to read shared visualization {job_id}: {e}")
+        return None
+    return orjson.loads(data) if data else None
+
+async def drop_shared_visualization(job_id: str):
+    """Remove a deleted visualization from Redis"""
+    if not redis_client:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(f"viz:{job_id}")
+            pipe.zrem(VIZ_INDEX_KEY, job_id)
+            await pipe.execute()
+    except Exception as e:
+        logger.error(f"Failed to drop shared visualization {job_id}: {e}")
+
+def enqueue_tileset(file_path: Path, job_id: str, tileset_id: str,
+                    visualization_type: str, batch_id: Optional[str] = None):
+    """Queue a Mapbox tileset creation for the tileset workers"""
+    queued_tileset_jobs.append(job_id)
+    update_visualization(job_id, status='queued', queue_position=len(queued_tileset_jobs))
+    tileset_queue.put_nowait((file_path, job_id, tileset_id, visualization_type, batch_id))
+
+async def tileset_worker():
+    """Create queued tilesets one at a time; several workers give bounded concurrency"""
+    while True:
+        job = await tileset_queue.get()
+        try:
+            # Everything queued behind this job moves up one place
+            queued_tileset_jobs.remove(job[1])
+            for position, queued_job_id in enumerate(queued_tileset_jobs, 1):
+                update_visualization(queued_job_id, queue_position=position)
+            update_visualization(job[1], status='processing', queue_position=None)
+            await create_mapbox_tileset_background(*job)
+        except Exception as e:
+            logger.error(f"Tileset worker error: {e}")
+        finally:
+            tileset_queue.task_done()
+
 async def create_mapbox_tileset_background(file_path: Path, job_id: str, 
                                           tileset_id: str, visualization_type: str,
                                           batch_id: Optional[str] = None):
@@ -1101,9 +1698,7 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
     try:
         if not Config.MAPBOX_TOKEN:
             logger.error("Mapbox token not configured")
-            if job_id in active_visualizations:
-                active_visualizations[job_id]['status'] = 'failed'
-                active_visualizations[job_id]['error'] = 'Mapbox token not configured'
+            update_visualization(job_id, status='failed', error='Mapbox token not configured')
             # Update file database
             if job_id in uploaded_files:
                 uploaded_files[job_id]['processing_status'] = 'failed'
@@ -1116,9 +1711,7 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
         # Verify file exists
         if not os.path.exists(file_path_str):
             logger.error(f"NetCDF file not found: {file_path_str}")
-            if job_id in active_visualizations:
-                active_visualizations[job_id]['status'] = 'failed'
-                active_visualizations[job_id]['error'] = 'Input file not found'
+            update_visualization(job_id, status='failed', error='Input file not found')
             # Update file database
             if job_id in uploaded_files:
                 uploaded_files[job_id]['processing_status'] = 'failed'
@@ -1143,24 +1736,34 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
             raster_manager = MTSRasterManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
             
             # Try to create raster tileset
-            result = await raster_manager.create_raster_tileset(file_path_str, tileset_id)
+            # The manager's coroutines make blocking requests/boto3 calls, so give
+            # them their own event loop on a worker thread
+            result = await asyncio.to_thread(
+                asyncio.run, raster_manager.create_raster_tileset(file_path_str, tileset_id)
+            )
             
             if result['success']:
                 actual_format = 'raster-array'
                 # Update visualization info
                 if job_id in active_visualizations:
-                    active_visualizations[job_id]['mapbox_tileset'] = result['tileset_id']
-                    active_visualizations[job_id]['status'] = 'completed'
-                    active_visualizations[job_id]['format'] = 'raster-array'
-                    active_visualizations[job_id]['actual_format'] = 'raster-array'
-                    active_visualizations[job_id]['requested_format'] = 'raster-array'
-                    active_visualizations[job_id]['source_layer'] = result.get('source_layer', '10winds')
-                    active_visualizations[job_id]['recipe_id'] = result.get('recipe_id')
-                    active_visualizations[job_id]['publish_job_id'] = result.get('publish_job_id')
+                    update_visualization(
+                        job_id,
+                        mapbox_tileset=result['tileset_id'],
+                        status='completed',
+                        format='raster-array',
+                        actual_format='raster-array',
+                        requested_format='raster-array',
+                        source_layer=result.get('source_layer', '10winds'),
+                        recipe_id=result.get('recipe_id'),
+                        publish_job_id=result.get('publish_job_id')
+                    )
                     
                     # Save recipe info with proper format
                     save_recipe_info(tileset_id, result, active_visualizations[job_id])
                 
+                # New tileset should show up on the next page load
+                invalidate_tileset_cache()
+                
                 # Update file database
                 if job_id in uploaded_files:
                     uploaded_files[job_id]['processing_status'] = 'completed'
@@ -1181,15 +1784,16 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
                 if result.get('fallback_to_vector', False) or result.get('error_code') == 422:
                     logger.warning("Raster-array requires Pro account, falling back to vector")
                     if job_id in active_visualizations:
-                        active_visualizations[job_id]['warning'] = result.get('error', 'Falling back to vector format')
-                        active_visualizations[job_id]['use_client_animation'] = True  # Flag for client-side animation
+                        update_visualization(
+                            job_id,
+                            warning=result.get('error', 'Falling back to vector format'),
+                            use_client_animation=True  # Flag for client-side animation
+                        )
                     actual_format = 'vector'  # Will fall back to vector
                 else:
                     # Some other error occurred
                     logger.error(f"Raster tileset creation failed: {result.get('error')}")
-                    if job_id in active_visualizations:
-                        active_visualizations[job_id]['error'] = result.get('error')
-                        active_visualizations[job_id]['status'] = 'failed'
+                    update_visualization(job_id, error=result.get('error'), status='failed')
                     
                     # Update file database
                     if job_id in uploaded_files:
@@ -1210,32 +1814,41 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
         if actual_format != 'raster-array':
             logger.info("Creating vector tileset...")
             
-            manager = MapboxTilesetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
+            manager = get_tileset_manager()
             
             # Process NetCDF to tileset
-            result = manager.process_netcdf_to_tileset(file_path_str, tileset_id)
+            result = await asyncio.to_thread(manager.process_netcdf_to_tileset, file_path_str, tileset_id)
             
             if result['success']:
                 actual_format = 'vector'
                 # Update visualization info
                 if job_id in active_visualizations:
-                    active_visualizations[job_id]['mapbox_tileset'] = result['tileset_id']
-                    active_visualizations[job_id]['status'] = 'completed'
-                    active_visualizations[job_id]['format'] = 'vector'
-                    active_visualizations[job_id]['actual_format'] = 'vector'
-                    active_visualizations[job_id]['source_layer'] = result.get('source_layer', 'weather_data')
-                    active_visualizations[job_id]['recipe_id'] = result.get('recipe_id')
-                    active_visualizations[job_id]['publish_job_id'] = result.get('publish_job_id')
+                    update_visualization(
+                        job_id,
+                        mapbox_tileset=result['tileset_id'],
+                        status='completed',
+                        format='vector',
+                        actual_format='vector',
+                        source_layer=result.get('source_layer', 'weather_data'),
+                        recipe_id=result.get('recipe_id'),
+                        publish_job_id=result.get('publish_job_id')
+                    )
                     
                     # Add warning if raster was requested but vector was created
                     if requested_format == 'raster-array':
-                        active_visualizations[job_id]['format_fallback'] = True
-                        active_visualizations[job_id]['warning'] = 'Created vector format (raster-array requires Pro account)'
-                        active_visualizations[job_id]['use_client_animation'] = True
+                        update_visualization(
+                            job_id,
+                            format_fallback=True,
+                            warning='Created vector format (raster-array requires Pro account)',
+                            use_client_animation=True
+                        )
                     
                     # Save recipe info with correct formats
                     save_recipe_info(tileset_id, result, active_visualizations[job_id])
                 
+                # New tileset should show up on the next page load
+                invalidate_tileset_cache()
+                
                 # Update file database
                 if job_id in uploaded_files:
                     uploaded_files[job_id]['processing_status'] = 'completed'
@@ -1252,9 +1865,7 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
                 error_msg = result.get('error', 'Unknown error')
                 logger.error(f"Tileset creation failed: {error_msg}")
                 
-                if job_id in active_visualizations:
-                    active_visualizations[job_id]['status'] = 'failed'
-                    active_visualizations[job_id]['error'] = error_msg
+                update_visualization(job_id, status='failed', error=error_msg)
                 
                 # Update file database
                 if job_id in uploaded_files:
@@ -1274,9 +1885,7 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
         import traceback
         traceback.print_exc()
         
-        if job_id in active_visualizations:
-            active_visualizations[job_id]['status'] = 'failed'
-            active_visualizations[job_id]['error'] = str(e)
+        update_visualization(job_id, status='failed', error=str(e))
         
         # Update file database
         if job_id in uploaded_files:
@@ -1293,7 +1902,7 @@ async def create_mapbox_tileset_background(file_path: Path, job_id: str,
 
 def save_recipe_info(tileset_id: str, result: Dict, viz_info: Dict):
     """Save recipe information for future reference"""
-    recipe_path = Config.RECIPE_DIR / f"recipe_{tileset_id}.json"
+    recipe_path = os.path.join(Config.RECIPE_DIR_STR, f"recipe_{tileset_id}.json")
     
     # Ensure we capture the actual format that was created
     actual_format = result.get('format', 'vector')
@@ -1323,19 +1932,25 @@ def save_recipe_info(tileset_id: str, result: Dict, viz_info: Dict):
     }
     
     try:
-        with open(str(recipe_path), 'w') as f:
-            json.dump(recipe_data, f, indent=2)
+        with open(recipe_path, 'wb') as f:
+            f.write(orjson.dumps(recipe_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+        saved_recipes[tileset_id] = recipe_data
+        _recipe_dir_state["mtime_ns"] = os.stat(Config.RECIPE_DIR_STR).st_mtime_ns
         logger.info(f"Saved recipe info to {recipe_path}")
     except Exception as e:
         logger.error(f"Failed to save recipe: {e}")
 
 @app.get("/api/visualization-status/{job_id}")
-async def get_visualization_status(job_id: str):
+async def get_visualization_status(job_id: str, request: Request):
     """Get status of visualization processing"""
-    if job_id not in active_visualizations:
+    viz_info = await get_shared_visualization(job_id)
+    if viz_info is None:
         raise HTTPException(404, "Job not found")
     
-    viz_info = active_visualizations[job_id]
+    # Pollers get a 304 until the visualization changes
+    etag = f'W/"{job_id}-{viz_info.get("_version", 0)}"'
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={"ETag": etag})
     
     # Update file database status if needed
     if job_id in uploaded_files:
@@ -1343,9 +1958,10 @@ async def get_visualization_status(job_id: str):
         if viz_info.get('error'):
             uploaded_files[job_id]['error'] = viz_info.get('error')
     
-    return JSONResponse({
+    return ORJSONResponse({
         "job_id": job_id,
         "status": viz_info.get('status', 'processing'),
+        "queue_position": viz_info.get('queue_position'),
         "tileset_id": viz_info.get('tileset_id'),
         "mapbox_tileset": viz_info.get('mapbox_tileset'),
         "error": viz_info.get('error'),
@@ -1366,7 +1982,7 @@ async def get_visualization_status(job_id: str):
         "center": viz_info.get('center'),
         "zoom": viz_info.get('zoom'),
         "batch_id": viz_info.get('batch_id')
-    })
+    }, headers={"ETag": etag})
 
 @app.get("/api/batch-status/{batch_id}")
 async def get_batch_status(batch_id: str):
@@ -1406,7 +2022,7 @@ async def get_batch_status(batch_id: str):
     batch_info['failed_files'] = failed
     batch_info['processing_files'] = processing
     
-    return JSONResponse(batch_info)
+    return ORJSONResponse(batch_info)
 
 @app.get("/api/tileset-status/{username}/{tileset_id}")
 async def get_tileset_publish_status(username: str, tileset_id: str):
@@ -1415,17 +2031,23 @@ async def get_tileset_publish_status(username: str, tileset_id: str):
         raise HTTPException(500, "Mapbox token not configured")
     
     try:
-        manager = MapboxTilesetManager(Config.MAPBOX_TOKEN, username)
-        status = manager.get_tileset_status(tileset_id)
+        cache_key = ("status", username, tileset_id)
+        status = tileset_info_cache.get(cache_key)
+        if status is None:
+            manager = get_tileset_manager(username)
+            status = await asyncio.to_thread(manager.get_tileset_status, tileset_id)
+            # Publishing status changes quickly; only ready tilesets are reused
+            if 'publishing' not in status and 'error' not in status:
+                tileset_info_cache[cache_key] = status
         
         # Also check for any active publishing jobs
         if 'publishing' in status:
-            return JSONResponse({
+            return ORJSONResponse({
                 "status": "publishing",
                 "complete": False
             })
         
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "ready",
             "complete": True,
             "tileset_info": status
@@ -1433,7 +2055,7 @@ async def get_tileset_publish_status(username: str, tileset_id: str):
         
     except Exception as e:
         logger.error(f"Error getting tileset status: {e}")
-        return JSONResponse({
+        return ORJSONResponse({
             "status": "error",
             "error": str(e)
         })
@@ -1444,7 +2066,7 @@ async def load_tileset(tileset_id: str = Form(...)):
     try:
         # Check if it's a default tileset
         if tileset_id == DEFAULT_TILESET['id']:
-            return JSONResponse({
+            return ORJSONResponse({
                 "success": True,
                 "tileset_id": tileset_id,
                 "type": "default",
@@ -1459,7 +2081,8 @@ async def load_tileset(tileset_id: str = Form(...)):
         
         # For user tilesets, check for recipe
         tileset_name = tileset_id.split('.')[-1] if '.' in tileset_id else tileset_id
-        recipe_files = list(Config.RECIPE_DIR.glob(f"*{tileset_name}*.json"))
+        refresh_recipes()
+        recipe_data = find_recipe(saved_recipes, tileset_name)
         
         format_type = 'vector'  # Default
         actual_format = 'vector'
@@ -1477,37 +2100,37 @@ async def load_tileset(tileset_id: str = Form(...)):
         zoom = None
         batch_id = None
         
-        if recipe_files:
-            try:
-                with open(recipe_files[0], 'r') as f:
-                    recipe_data = json.load(f)
-                    format_type = recipe_data.get('format', 'vector')
-                    actual_format = recipe_data.get('actual_format', format_type)
-                    requested_format = recipe_data.get('requested_format', format_type)
-                    source_layer = recipe_data.get('source_layer', 'weather_data')
-                    scalar_vars = recipe_data.get('scalar_vars', [])
-                    vector_pairs = recipe_data.get('vector_pairs', [])
-                    visualization_type = recipe_data.get('visualization_type', 'vector')
-                    is_raster_array = recipe_data.get('is_raster_array', False)
-                    use_client_animation = recipe_data.get('use_client_animation', False)
-                    session_id = recipe_data.get('session_id')
-                    bounds = recipe_data.get('bounds')
-                    center = recipe_data.get('center')
-                    zoom = recipe_data.get('zoom')
-                    batch_id = recipe_data.get('batch_id')
-                    
-                    # Double-check format based on source layer
-                    if source_layer == '10winds' or is_raster_array:
-                        actual_format = 'raster-array'
-                    
-                logger.info(f"Found recipe for {tileset_name}, format: {format_type}, actual: {actual_format}, requested: {requested_format}")
-            except Exception as e:
-                logger.error(f"Error reading recipe: {e}")
+        if recipe_data is not None:
+            format_type = recipe_data.get('format', 'vector')
+            actual_format = recipe_data.get('actual_format', format_type)
+            requested_format = recipe_data.get('requested_format', format_type)
+            source_layer = recipe_data.get('source_layer', 'weather_data')
+            scalar_vars = recipe_data.get('scalar_vars', [])
+            vector_pairs = recipe_data.get('vector_pairs', [])
+            visualization_type = recipe_data.get('visualization_type', 'vector')
+            is_raster_array = recipe_data.get('is_raster_array', False)
+            use_client_animation = recipe_data.get('use_client_animation', False)
+            session_id = recipe_data.get('session_id')
+            bounds = recipe_data.get('bounds')
+            center = recipe_data.get('center')
+            zoom = recipe_data.get('zoom')
+            batch_id = recipe_data.get('batch_id')
+            
+            # Double-check format based on source layer
+            if source_layer == '10winds' or is_raster_array:
+                actual_format = 'raster-array'
+            
+            logger.info(f"Found recipe for {tileset_name}, format: {format_type}, actual: {actual_format}, requested: {requested_format}")
         
         # Check if tileset exists on Mapbox and verify its type
         if Config.MAPBOX_TOKEN:
-            manager = MapboxTilesetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
-            tileset_info = manager.check_tileset_format(tileset_id)
+            cache_key = ("format", Config.MAPBOX_USERNAME, tileset_id)
+            tileset_info = tileset_info_cache.get(cache_key)
+            if tileset_info is None:
+                manager = get_tileset_manager()
+                tileset_info = await asyncio.to_thread(manager.check_tileset_format, tileset_id)
+                if tileset_info.get('success'):
+                    tileset_info_cache[cache_key] = tileset_info
             
             if tileset_info.get('success'):
                 # Use the format information from Mapbox
@@ -1519,7 +2142,7 @@ async def load_tileset(tileset_id: str = Form(...)):
                     
                 logger.info(f"Mapbox confirms tileset format: {actual_format}")
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "tileset_id": tileset_id,
             "type": "user",
@@ -1544,52 +2167,65 @@ async def load_tileset(tileset_id: str = Form(...)):
         
     except Exception as e:
         logger.error(f"Error loading tileset: {str(e)}")
-        return JSONResponse({
+        return ORJSONResponse({
             "success": False,
             "error": str(e)
         }, status_code=500)
 
-@app.get("/api/wind-data/{session_id}")
-async def get_wind_data(session_id: str):
-    """Get wind data for client-side animation"""
+def reextract_wind_data(viz_info: Dict) -> Optional[Dict]:
+    """Re-read client wind data for a visualization whose session has expired"""
+    file_path = viz_info.get('file_path')
+    wind_components = viz_info.get('wind_components')
+    if not (file_path and wind_components and os.path.exists(file_path)):
+        return None
+    with open_processed_dataset(file_path, viz_info.get('zarr_path')) as ds:
+        return extract_wind_data_for_client(ds, wind_components, viz_info.get('bounds'))
+
+async def load_session_wind_data(session_id: str) -> Dict:
+    """Wind data for a session, re-extracted from its file when the session has expired"""
     if session_id not in active_sessions:
         # Try to load from active visualizations
         if session_id in active_visualizations:
-            viz_info = active_visualizations[session_id]
-            file_path = viz_info.get('file_path')
-            
-            if file_path and os.path.exists(file_path):
-                try:
-                    # Re-extract wind data
-                    ds = xr.open_dataset(file_path)
-                    wind_components = viz_info.get('wind_components')
-                    bounds = viz_info.get('bounds')
-                    
-                    if wind_components:
-                        wind_data = extract_wind_data_for_client(ds, wind_components, bounds)
-                        ds.close()
-                        
-                        if wind_data:
-                            return JSONResponse({
-                                "success": True,
-                                **wind_data
-                            })
-                except Exception as e:
-                    logger.error(f"Error re-extracting wind data: {e}")
+            try:
+                wind_data = await asyncio.to_thread(reextract_wind_data, active_visualizations[session_id])
+                if wind_data:
+                    return wind_data
+            except Exception as e:
+                logger.error(f"Error re-extracting wind data: {e}")
         
         raise HTTPException(404, "Session not found")
     
-    session_data = active_sessions[session_id]
-    wind_data = session_data.get('wind_data')
-    
+    wind_data = active_sessions[session_id].get('wind_data')
     if not wind_data:
         raise HTTPException(404, "No wind data available for this session")
+    return wind_data
+
+@app.get("/api/wind-data/{session_id}")
+async def get_wind_data(session_id: str, encoding: str = "json"):
+    """Get wind data for client-side animation (encoding=base64 for float32 buffers)"""
+    wind_data = await load_session_wind_data(session_id)
+    
+    if encoding == "base64":
+        wind_data = encode_wind_data(wind_data)
     
-    return JSONResponse({
+    return ORJSONResponse({
         "success": True,
         **wind_data
     })
 
+@app.get("/api/wind-data/{session_id}/binary")
+async def get_wind_data_binary(session_id: str):
+    """Wind grids as raw little-endian float32: u, v then speed planes, shape in X-Shape"""
+    wind_data = await load_session_wind_data(session_id)
+    
+    planes = np.stack([wind_data["u_component"], wind_data["v_component"], wind_data["speed"]])
+    rows, cols = wind_data["grid"]["shape"]
+    return Response(
+        content=planes.astype('<f4', copy=False).tobytes(),
+        media_type="application/octet-stream",
+        headers={"X-Shape": f"3,{rows},{cols}"}
+    )
+
 @app.post("/api/upload-netcdf-as-dataset")
 async def upload_netcdf_as_dataset(
     background_tasks: BackgroundTasks,
@@ -1602,25 +2238,14 @@ async def upload_netcdf_as_dataset(
     if not file.filename.endswith('.nc'):
         raise HTTPException(400, "Only NetCDF (.nc) files are allowed")
     
-    # Check file size
-    content = await file.read()
-    file_size = len(content)
-    
-    if file_size > Config.MAX_FILE_SIZE:
-        raise HTTPException(400, f"File too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB")
-    
     # Create job
-    job_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    job_id = new_job_id()
     
     # Save file temporarily
-    safe_filename = Path(file.filename).name
-    safe_filename = ''.join(c if c.isalnum() or c in '.-_' else '_' for c in safe_filename)
-    file_path = Config.UPLOAD_DIR / f"{job_id}_{safe_filename}"
+    file_path = get_upload_path(job_id, file.filename)
+    await save_upload_file(file, file_path)
     
     try:
-        async with aiofiles.open(str(file_path), 'wb') as f:
-            await f.write(content)
-        
         # Process in background
         background_tasks.add_task(
             create_dataset_background,
@@ -1630,7 +2255,7 @@ async def upload_netcdf_as_dataset(
             file.filename
         )
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "job_id": job_id,
             "message": "File uploaded. Creating dataset...",
@@ -1685,26 +2310,13 @@ async def upload_netcdf_batch_as_datasets(
     
     # Process each file
     for i, file in enumerate(files):
-        content = await file.read()
-        
-        # Check file size
-        if len(content) > Config.MAX_FILE_SIZE:
-            batch_jobs[batch_id]['errors'].append({
-                "filename": file.filename,
-                "error": f"File too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB"
-            })
-            continue
-        
-        job_id = f"{batch_id}_{i}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        job_id = f"{batch_id}_{i}_{new_job_id()}"
         
         # Save file
-        safe_filename = Path(file.filename).name
-        safe_filename = ''.join(c if c.isalnum() or c in '.-_' else '_' for c in safe_filename)
-        file_path = Config.UPLOAD_DIR / f"{job_id}_{safe_filename}"
+        file_path = get_upload_path(job_id, file.filename)
         
         try:
-            async with aiofiles.open(str(file_path), 'wb') as f:
-                await f.write(content)
+            await save_upload_file(file, file_path)
             
             dataset_name = None
             if dataset_name_list and i < len(dataset_name_list):
@@ -1735,7 +2347,7 @@ async def upload_netcdf_batch_as_datasets(
             if file_path.exists():
                 file_path.unlink()
     
-    return JSONResponse(batch_jobs[batch_id])
+    return ORJSONResponse(batch_jobs[batch_id])
 
 async def create_dataset_background(
     file_path: Path,
@@ -1758,7 +2370,7 @@ async def create_dataset_background(
         if not dataset_name:
             dataset_name = f"Weather Data - {Path(original_filename).stem}"
         
-        result = dataset_manager.process_netcdf_to_dataset(str(file_path), dataset_name)
+        result = await asyncio.to_thread(dataset_manager.process_netcdf_to_dataset, str(file_path), dataset_name)
         
         # Store dataset info
         if result['success']:
@@ -1868,7 +2480,7 @@ async def get_dataset_status(job_id: str):
     if job_id not in active_datasets:
         raise HTTPException(404, "Job not found")
     
-    return JSONResponse(active_datasets[job_id])
+    return ORJSONResponse(active_datasets[job_id])
 
 @app.get("/api/list-datasets")
 async def list_datasets():
@@ -1878,20 +2490,19 @@ async def list_datasets():
     
     try:
         dataset_manager = MapboxDatasetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
-        datasets = dataset_manager.list_datasets(limit=100)
+        datasets = await asyncio.to_thread(dataset_manager.list_datasets, limit=100)
         
         # Add weather data indicator
         weather_datasets = []
         for ds in datasets:
             # Include weather-related datasets
-            dataset_name = ds.get('name', '').lower()
+            dataset_name = ds.get('name', '')
             dataset_id = ds.get('id', '')
             
-            if any(keyword in dataset_name or keyword in dataset_id.lower() 
-                  for keyword in ['weather', 'netcdf', 'wind', 'temperature', 'pressure']):
+            if DATASET_KEYWORDS_RE.search(dataset_name) or DATASET_KEYWORDS_RE.search(dataset_id):
                 weather_datasets.append(ds)
         
-        return JSONResponse({
+        return ORJSONResponse({
             "success": True,
             "total_datasets": len(datasets),
             "weather_datasets": weather_datasets,
@@ -1910,12 +2521,12 @@ async def get_dataset_info(dataset_id: str):
     
     try:
         dataset_manager = MapboxDatasetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
-        info = dataset_manager.get_dataset_info(dataset_id)
+        info = await asyncio.to_thread(dataset_manager.get_dataset_info, dataset_id)
         
         if 'error' in info:
             raise HTTPException(404, info['error'])
         
-        return JSONResponse(info)
+        return ORJSONResponse(info)
         
     except HTTPException:
         raise
@@ -1931,7 +2542,7 @@ async def delete_dataset(dataset_id: str):
     
     try:
         dataset_manager = MapboxDatasetManager(Config.MAPBOX_TOKEN, Config.MAPBOX_USERNAME)
-        success = dataset_manager.delete_dataset(dataset_id)
+        success = await asyncio.to_thread(dataset_manager.delete_dataset, dataset_id)
         
         if success:
             # Remove from active datasets if exists
@@ -1950,7 +2561,7 @@ async def delete_dataset(dataset_id: str):
 @app.get("/api/active-datasets")
 async def get_active_datasets():
     """Get list of recently created datasets"""
-    return JSONResponse({
+    return ORJSONResponse({
         "datasets": list(active_datasets.values()),
         "total": len(active_datasets)
     })
@@ -1971,7 +2582,7 @@ async def convert_dataset_to_tileset(
         # 3. Creating and publishing a tileset
         
         # For now, return a placeholder
-        return JSONResponse({
+        return ORJSONResponse({
             "success": False,
             "message": "Dataset to tileset conversion requires additional implementation",
             "info": "You can export the dataset from Mapbox Studio and then upload as a tileset"
@@ -1981,6 +2592,27 @@ async def convert_dataset_to_tileset(
         logger.error(f"Error converting dataset to tileset: {str(e)}")
         raise HTTPException(500, str(e))
 
+def summarize_visualization(job_id: str, viz: Dict) -> Dict:
+    """Build the listing entry for one visualization"""
+    return {
+        "job_id": job_id,
+        "tileset_id": viz.get('tileset_id'),
+        "mapbox_tileset": viz.get('mapbox_tileset'),
+        "status": viz.get('status', 'processing'),
+        "created_at": viz.get('created_at'),
+        "format": viz.get('format', 'vector'),
+        "actual_format": viz.get('actual_format', viz.get('format', 'vector')),
+        "requested_format": viz.get('requested_format', 'vector'),
+        "wind_components": viz.get('wind_components'),
+        "scalar_vars": viz.get('scalar_vars', []),
+        "vector_pairs": viz.get('vector_pairs', []),
+        "use_client_animation": viz.get('use_client_animation', False),
+        "session_id": viz.get('session_id'),
+        "bounds": viz.get('bounds'),
+        "center": viz.get('center'),
+        "zoom": viz.get('zoom')
+    }
+
 @app.get("/api/active-visualizations")
 async def get_active_visualizations():
     """Get list of active visualizations"""
@@ -1988,52 +2620,43 @@ async def get_active_visualizations():
     batched_visualizations = {}
     single_visualizations = []
     
-    for job_id, viz in active_visualizations.items():
-        batch_id = viz.get('batch_id')
-        if batch_id:
-            if batch_id not in batched_visualizations:
-                batched_visualizations[batch_id] = []
-            batched_visualizations[batch_id].append({
-                "job_id": job_id,
-                "tileset_id": viz.get('tileset_id'),
-                "mapbox_tileset": viz.get('mapbox_tileset'),
-                "status": viz.get('status', 'processing'),
-                "created_at": viz.get('created_at'),
-                "format": viz.get('format', 'vector'),
-                "actual_format": viz.get('actual_format', viz.get('format', 'vector')),
-                "requested_format": viz.get('requested_format', 'vector'),
-                "wind_components": viz.get('wind_components'),
-                "scalar_vars": viz.get('scalar_vars', []),
-                "vector_pairs": viz.get('vector_pairs', []),
-                "use_client_animation": viz.get('use_client_animation', False),
-                "session_id": viz.get('session_id'),
-                "bounds": viz.get('bounds'),
-                "center": viz.get('center'),
-                "zoom": viz.get('zoom')
-            })
-        else:
-            single_visualizations.append({
-                "job_id": job_id,
-                "tileset_id": viz.get('tileset_id'),
-                "mapbox_tileset": viz.get('mapbox_tileset'),
-                "status": viz.get('status', 'processing'),
-                "created_at": viz.get('created_at'),
-                "format": viz.get('format', 'vector'),
-                "actual_format": viz.get('actual_format', viz.get('format', 'vector')),
-                "requested_format": viz.get('requested_format', 'vector'),
-                "wind_components": viz.get('wind_components'),
-                "scalar_vars": viz.get('scalar_vars', []),
-                "vector_pairs": viz.get('vector_pairs', []),
-                "use_client_animation": viz.get('use_client_animation', False),
-                "session_id": viz.get('session_id'),
-                "bounds": viz.get('bounds'),
-                "center": viz.get('center'),
-                "zoom": viz.get('zoom')
-            })
+    visualizations = dict(active_visualizations)
+    if redis_client:
+        # Include visualizations created on other workers
+        try:
+            job_ids = [job_id.decode() for job_id in
+                       await redis_client.zrevrange(VIZ_INDEX_KEY, 0, ACTIVE_LIST_LIMIT - 1)]
+            missing = [job_id for job_id in job_ids if job_id not in visualizations]
+            if missing:
+                records = await redis_client.mget([f"viz:{job_id}" for job_id in missing])
+                for job_id, data in zip(missing, records):
+                    if data:
+                        visualizations[job_id] = orjson.loads(data)
+        except Exception as e:
+            logger.error(f"Failed to list shared visualizations: {e}")
+    
+    # Every change to a visualization bumps its _version, so the listing only
+    # needs rebuilding when the set of (job_id, _version) pairs changes
+    listing_key = tuple((job_id, viz.get('_version')) for job_id, viz in visualizations.items())
+    if listing_key != _viz_listing_cache["key"]:
+        for job_id, viz in visualizations.items():
+            summary = summarize_visualization(job_id, viz)
+            batch_id = viz.get('batch_id')
+            if batch_id:
+                batched_visualizations.setdefault(batch_id, []).append(summary)
+            else:
+                single_visualizations.append(summary)
+        
+        _viz_listing_cache.update(
+            key=listing_key,
+            single=orjson.Fragment(orjson.dumps(single_visualizations, option=orjson.OPT_SERIALIZE_NUMPY)),
+            batched=orjson.Fragment(orjson.dumps(batched_visualizations, option=orjson.OPT_SERIALIZE_NUMPY))
+        )
     
-    return JSONResponse({
-        "single_visualizations": single_visualizations,
-        "batched_visualizations": batched_visualizations,
+    # batch_jobs is updated in place, so it is serialized fresh each time
+    return ORJSONResponse({
+        "single_visualizations": _viz_listing_cache["single"],
+        "batched_visualizations": _viz_listing_cache["batched"],
         "batch_jobs": batch_jobs
     })
 
@@ -2056,6 +2679,8 @@ async def delete_visualization(job_id: str):
     
     # Remove from active visualizations
     del active_visualizations[job_id]
+    await drop_shared_visualization(job_id)
+    remove_zarr_copy(job_id)
     
     # Remove from active sessions if exists
     if job_id in active_sessions:
@@ -2093,6 +2718,8 @@ async def delete_batch(batch_id: str):
             
             # Remove from active visualizations
             del active_visualizations[job_id]
+            await drop_shared_visualization(job_id)
+            remove_zarr_copy(job_id)
             
             # Remove from active sessions if exists
             if job_id in active_sessions:
@@ -2128,26 +2755,60 @@ async def health_check():
         "version": "5.0.0"
     }
 
+def remove_old_files(cutoff_time: float):
+    """Delete unused uploads and processed files last modified before cutoff_time"""
+    for dir_path in [Config.UPLOAD_DIR_STR, Config.PROCESSED_DIR_STR]:
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                is_zarr = entry.name.endswith('.zarr') and entry.is_dir(follow_symlinks=False)
+                if not (is_zarr or entry.is_file(follow_symlinks=False)) or entry.stat().st_mtime >= cutoff_time:
+                    continue
+                # Check if file is still in use
+                file_id = entry.name.split('.', 1)[0].split('_')[0]
+                if file_id not in uploaded_files and file_id not in active_visualizations:
+                    if is_zarr:
+                        shutil.rmtree(entry.path, ignore_errors=True)
+                    else:
+                        os.unlink(entry.path)
+                    logger.info(f"Cleaned up old file: {entry.path}")
+
+def remove_expired_uploads(cutoff_time: float):
+    """Delete files of manifest uploads created before cutoff_time that are no longer in use"""
+    in_use = []
+    while upload_manifest and upload_manifest[0][0] < cutoff_time:
+        _, job_id, upload_path = upload_manifest.popleft()
+        if job_id in uploaded_files or job_id in active_visualizations:
+            in_use.append((job_id, upload_path))
+            continue
+        for path in (upload_path, get_summary_path(job_id)):
+            try:
+                os.unlink(path)
+                logger.info(f"Cleaned up old file: {path}")
+            except FileNotFoundError:
+                pass
+        remove_zarr_copy(job_id)
+    
+    # Uploads still in use are checked again a full expiry period from now,
+    # which keeps the manifest ordered by time
+    now = time.time()
+    upload_manifest.extend((now, job_id, upload_path) for job_id, upload_path in in_use)
+
 # Cleanup old files periodically
-async def cleanup_old_files():
-    """Remove old temporary files"""
+async def cleanup_old_files(full_scan: bool = False):
+    """Remove old temporary files; full_scan also sweeps files from before this process started"""
     try:
-        cutoff_time = datetime.now().timestamp() - (24 * 3600)  # 24 hours
+        cutoff_time = time.time() - (24 * 3600)  # 24 hours
+        # created_at values are local ISO strings, which order like the times they encode
+        cutoff_iso = datetime.fromtimestamp(cutoff_time).isoformat()
         
-        for dir_path in [Config.UPLOAD_DIR, Config.PROCESSED_DIR]:
-            for file_path in dir_path.glob("*"):
-                if file_path.is_file() and file_path.stat().st_mtime < cutoff_time:
-                    # Check if file is still in use
-                    file_id = file_path.stem.split('_')[0]
-                    if file_id not in uploaded_files and file_id not in active_visualizations:
-                        file_path.unlink()
-                        logger.info(f"Cleaned up old file: {file_path}")
+        # Directory scans and deletes run on a worker thread
+        await asyncio.to_thread(remove_old_files if full_scan else remove_expired_uploads, cutoff_time)
         
         # Clean up old sessions
         to_remove = []
         for session_id, session_data in active_sessions.items():
-            created_at = datetime.fromisoformat(session_data.get('created_at', datetime.now().isoformat()))
-            if (datetime.now() - created_at).total_seconds() > 24 * 3600:
+            created_at = session_data.get('created_at')
+            if created_at and created_at < cutoff_iso:
                 to_remove.append(session_id)
         
         for session_id in to_remove:
@@ -2157,8 +2818,8 @@ async def cleanup_old_files():
         # Clean up old batch jobs
         to_remove = []
         for batch_id, batch_data in batch_jobs.items():
-            created_at = datetime.fromisoformat(batch_data.get('created_at', datetime.now().isoformat()))
-            if (datetime.now() - created_at).total_seconds() > 24 * 3600:
+            created_at = batch_data.get('created_at')
+            if created_at and created_at < cutoff_iso:
                 to_remove.append(batch_id)
         
         for batch_id in to_remove:
@@ -2168,10 +2829,24 @@ async def cleanup_old_files():
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
 
+async def periodic_cleanup():
+    """Run cleanup_old_files every CLEANUP_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        await cleanup_old_files()
+
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Weather Visualization Platform...")
+    if cleanup_task:
+        cleanup_task.cancel()
+    for worker in tileset_workers:
+        worker.cancel()
+    for manager in tileset_managers.values():
+        manager.close()
+    if redis_client:
+        await redis_client.aclose()
     executor.shutdown(wait=True)
 
 if __name__ == "__main__":
@@ -2181,9 +2856,19 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
     host = os.getenv("HOST", "0.0.0.0")
     
+    reload = os.getenv("DEBUG", "False").lower() == "true"
+    
+    # Visualization state is held in-process, so keep one worker unless told otherwise
+    workers = int(os.getenv("WORKERS", os.getenv("WEB_CONCURRENCY", "1")))
+    
     uvicorn.run(
-        app,
+        "app:app",
         host=host,
         port=port,
-        reload=os.getenv("DEBUG", "False").lower() == "true"
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+        workers=1 if reload else workers,
+        backlog=int(os.getenv("BACKLOG", "2048")),
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", "30")),  # Status pollers reuse connections
+        reload=reload
     )
\ No newline at end of file
@@ -1,16 +1,23 @@
 # app_simplified.py - Simplified Weather Visualization without Mapbox Tilesets
 from fastapi import FastAPI, UploadFile, File, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 import xarray as xr
+import netCDF4
+from cachetools import LRUCache
 import numpy as np
 import os
 import json
+import time
+import secrets
 from pathlib import Path
+from contextlib import contextmanager
 from typing import Optional, Dict, List
-import aiofiles
+import asyncio
+import shutil
+import threading
 from datetime import datetime
 import logging
 from dotenv import load_dotenv
@@ -23,7 +30,12 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
-app = FastAPI(title="Weather Visualization Platform", version="2.0.0")
+# ORJSONResponse serializes numpy arrays directly, so handlers skip .tolist()
+app = FastAPI(
+    title="Weather Visualization Platform",
+    version="2.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Enable CORS
 app.add_middleware(
@@ -55,6 +67,60 @@ templates = Jinja2Templates(directory=str(Config.TEMPLATES_DIR))
 # Store active sessions
 active_sessions = {}
 
+class DatasetHandle:
+    """An open dataset and the number of requests currently reading it"""
+    def __init__(self, ds: xr.Dataset):
+        self.ds = ds
+        self.readers = 0
+        self.retired = False
+
+def retire_dataset(handle: DatasetHandle):
+    """Close a handle now, or when its last reader finishes; call with open_datasets_lock held"""
+    handle.retired = True
+    if handle.readers == 0:
+        handle.ds.close()
+
+class DatasetCache(LRUCache):
+    """LRU of open dataset handles that retires the ones it evicts"""
+    def popitem(self):
+        session_id, handle = super().popitem()
+        retire_dataset(handle)
+        return session_id, handle
+
+# Open datasets by session, so repeated /api/wind-data calls skip re-opening the file
+open_datasets = DatasetCache(maxsize=16)
+
+# Wind-data requests run on worker threads, so cache access is serialized
+open_datasets_lock = threading.Lock()
+
+@contextmanager
+def session_dataset(session_id: str):
+    """Open dataset for a session, reusing the handle from earlier requests.
+    
+    The handle isn't closed while the block runs, even if it is evicted or
+    its session is deleted meanwhile.
+    """
+    with open_datasets_lock:
+        handle = open_datasets.get(session_id)
+        if handle is None:
+            handle = DatasetHandle(xr.open_dataset(active_sessions[session_id]["file_path"]))
+            open_datasets[session_id] = handle
+        handle.readers += 1
+    try:
+        yield handle.ds
+    finally:
+        with open_datasets_lock:
+            handle.readers -= 1
+            if handle.retired and handle.readers == 0:
+                handle.ds.close()
+
+def close_session_dataset(session_id: str):
+    """Forget a session's cached dataset, closing it once no request is reading it"""
+    with open_datasets_lock:
+        handle = open_datasets.pop(session_id, None)
+        if handle is not None:
+            retire_dataset(handle)
+
 @app.get("/", response_class=HTMLResponse)
 async def main_page(request: Request):
     """Main page with weather visualization"""
@@ -71,31 +137,23 @@ async def upload_netcdf(file: UploadFile = File(...)):
     if not file.filename.endswith('.nc'):
         raise HTTPException(400, "Only NetCDF (.nc) files are allowed")
     
-    # Create session ID
-    session_id = datetime.now().strftime("%Y%m%d%H%M%S")
+    # Create session ID; the random suffix keeps uploads in the same second apart
+    session_id = f"{time.time_ns()}_{secrets.token_hex(4)}"
     
     # Save file temporarily with chunked reading
     file_path = Config.UPLOAD_DIR / f"{session_id}_{file.filename}"
     
     try:
-        # Save file in chunks to handle large files
-        async with aiofiles.open(file_path, 'wb') as f:
-            chunk_size = 1024 * 1024  # 1MB chunks
-            total_size = 0
-            
-            while chunk := await file.read(chunk_size):
-                total_size += len(chunk)
-                if total_size > Config.MAX_FILE_SIZE:
-                    # Clean up partial file
-                    await f.close()
-                    file_path.unlink()
-                    raise HTTPException(400, f"File too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB")
-                await f.write(chunk)
+        # Copy the spooled upload to disk on a worker thread
+        total_size = await asyncio.to_thread(stream_to_disk, file.file, file_path)
+        if total_size > Config.MAX_FILE_SIZE:
+            file_path.unlink()
+            raise HTTPException(400, f"File too large. Maximum size is {Config.MAX_FILE_SIZE / 1024 / 1024}MB")
         
         logger.info(f"Saved file: {file_path} ({total_size / 1024 / 1024:.1f}MB)")
         
         # Analyze NetCDF file
-        result = analyze_netcdf(file_path, session_id)
+        result = await asyncio.to_thread(analyze_netcdf, file_path, session_id)
         
         # Store session info
         active_sessions[session_id] = {
@@ -104,7 +162,7 @@ async def upload_netcdf(file: UploadFile = File(...)):
             "created_at": datetime.now().isoformat()
         }
         
-        return JSONResponse(result)
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -115,97 +173,109 @@ async def upload_netcdf(file: UploadFile = File(...)):
             file_path.unlink()
         raise HTTPException(500, f"Error processing file: {str(e)}")
 
+def stream_to_disk(src, file_path: Path) -> int:
+    """Copy an upload's file object to file_path in 8MB blocks; returns bytes written"""
+    src.seek(0)
+    with open(file_path, 'wb', buffering=0) as dst:
+        shutil.copyfileobj(src, dst, length=8 * 1024 * 1024)
+        return os.fstat(dst.fileno()).st_size
+
 def analyze_netcdf(file_path: Path, session_id: str) -> Dict:
     """Analyze NetCDF file and extract data"""
     try:
-        # Open with chunks for large files
-        ds = xr.open_dataset(file_path, chunks='auto')
-        
-        # Extract metadata
-        metadata = {
-            "dimensions": dict(ds.dims),
-            "variables": list(ds.data_vars),
-            "coordinates": list(ds.coords),
-            "attributes": dict(ds.attrs)
-        }
-        
-        # Find spatial coordinates
-        lat_name = None
-        lon_name = None
-        for coord in ['lat', 'latitude', 'y', 'LAT', 'Latitude']:
-            if coord in ds.coords:
-                lat_name = coord
-                break
-        for coord in ['lon', 'longitude', 'x', 'LON', 'Longitude']:
-            if coord in ds.coords:
-                lon_name = coord
-                break
-        
-        if not lat_name or not lon_name:
-            raise ValueError("Could not find latitude/longitude coordinates")
-        
-        # Get coordinate values
-        lats = ds[lat_name].values
-        lons = ds[lon_name].values
-        
-        # Identify wind components
-        wind_components = find_wind_components(ds)
-        
-        # Extract first time step of wind data if available
-        wind_data = None
-        if wind_components:
-            u_var = ds[wind_components['u']]
-            v_var = ds[wind_components['v']]
+        # Read metadata and the preview slab straight from netCDF4; only the
+        # strided cells of the wind variables are pulled off disk
+        with netCDF4.Dataset(str(file_path)) as nc:
+            variables = nc.variables
+            coord_names = [name for name in variables if name in nc.dimensions]
+            for var in variables.values():
+                for name in getattr(var, 'coordinates', '').split():
+                    if name in variables and name not in coord_names:
+                        coord_names.append(name)
+            data_vars = [name for name in variables if name not in coord_names]
             
-            # Handle time dimension
-            if 'time' in u_var.dims:
-                u_var = u_var.isel(time=0)
-                v_var = v_var.isel(time=0)
+            # Extract metadata
+            metadata = {
+                "dimensions": {name: len(dim) for name, dim in nc.dimensions.items()},
+                "variables": data_vars,
+                "coordinates": coord_names,
+                "attributes": {name: nc.getncattr(name) for name in nc.ncattrs()}
+            }
             
-            # Get data values with subsampling for large datasets
-            if len(lats) > 200 or len(lons) > 200:
-                # Subsample for preview
-                lat_step = max(1, len(lats) // 100)
-                lon_step = max(1, len(lons) // 100)
-                
-                u_data = u_var.values[::lat_step, ::lon_step]
-                v_data = v_var.values[::lat_step, ::lon_step]
-                lats_preview = lats[::lat_step]
-                lons_preview = lons[::lon_step]
-            else:
-                u_data = u_var.values
-                v_data = v_var.values
-                lats_preview = lats
-                lons_preview = lons
+            # Find spatial coordinates
+            lat_name = None
+            lon_name = None
+            for coord in ['lat', 'latitude', 'y', 'LAT', 'Latitude']:
+                if coord in coord_names:
+                    lat_name = coord
+                    break
+            for coord in ['lon', 'longitude', 'x', 'LON', 'Longitude']:
+                if coord in coord_names:
+                    lon_name = coord
+                    break
             
-            # Handle NaN values
-            u_data = np.nan_to_num(u_data, nan=0.0)
-            v_data = np.nan_to_num(v_data, nan=0.0)
+            if not lat_name or not lon_name:
+                raise ValueError("Could not find latitude/longitude coordinates")
             
-            # Calculate wind speed and direction
-            speed = np.sqrt(u_data**2 + v_data**2)
-            direction = np.arctan2(v_data, u_data) * 180 / np.pi
+            # Get coordinate values
+            lats = np.ma.filled(variables[lat_name][:].astype(np.float64), np.nan)
+            lons = np.ma.filled(variables[lon_name][:].astype(np.float64), np.nan)
             
-            wind_data = {
-                "u": u_data.tolist(),
-                "v": v_data.tolist(),
-                "speed": speed.tolist(),
-                "direction": direction.tolist(),
-                "units": u_var.attrs.get('units', 'm/s'),
-                "preview_lats": lats_preview.tolist(),
-                "preview_lons": lons_preview.tolist()
-            }
+            # Identify wind components
+            wind_components = find_wind_components(data_vars)
+            
+            # Extract first time step of wind data if available
+            wind_data = None
+            if wind_components:
+                u_var = variables[wind_components['u']]
+                v_var = variables[wind_components['v']]
+                
+                # The wind grid's last two dims are (y, x), whether the
+                # lat/lon coordinates are 1-D or curvilinear 2-D
+                y_dim, x_dim = u_var.dimensions[-2:]
+                ny, nx = u_var.shape[-2:]
+                
+                # Subsample large grids for preview
+                if ny > 200 or nx > 200:
+                    lat_step = max(1, ny // 100)
+                    lon_step = max(1, nx // 100)
+                else:
+                    lat_step = lon_step = 1
+                
+                steps = {y_dim: lat_step, x_dim: lon_step}
+                u_data = read_strided(u_var, steps)
+                v_data = read_strided(v_var, steps)
+                lats_preview = stride_coordinate(lats, variables[lat_name].dimensions, steps)
+                lons_preview = stride_coordinate(lons, variables[lon_name].dimensions, steps)
+                
+                # Handle NaN values
+                u_data, v_data = clean_wind_components(u_data, v_data)
+                
+                # Calculate wind speed and direction without temporaries
+                speed = np.hypot(u_data, v_data)
+                direction = np.arctan2(v_data, u_data)
+                np.degrees(direction, out=direction)
+                
+                wind_data = {
+                    "u": u_data,
+                    "v": v_data,
+                    "speed": speed,
+                    "direction": direction,
+                    "units": getattr(u_var, 'units', 'm/s'),
+                    "preview_lats": np.ascontiguousarray(lats_preview),
+                    "preview_lons": np.ascontiguousarray(lons_preview)
+                }
         
         # Get bounds
+        south, north = coordinate_range(lats)
+        west, east = coordinate_range(lons)
         bounds = {
-            "north": float(np.max(lats)),
-            "south": float(np.min(lats)),
-            "east": float(np.max(lons)),
-            "west": float(np.min(lons))
+            "north": north,
+            "south": south,
+            "east": east,
+            "west": west
         }
         
-        ds.close()
-        
         return {
             "success": True,
             "session_id": session_id,
@@ -223,29 +293,138 @@ def analyze_netcdf(file_path: Path, session_id: str) -> Dict:
         logger.error(f"Error analyzing NetCDF: {str(e)}")
         raise
 
-def find_wind_components(ds: xr.Dataset) -> Optional[Dict[str, str]]:
-    """Find U and V wind components in dataset"""
-    u_patterns = ['u', 'u10', 'u_wind', 'u_component', 'eastward']
-    v_patterns = ['v', 'v10', 'v_wind', 'v_component', 'northward']
-    
-    variables = list(ds.data_vars)
+def coordinate_range(values: np.ndarray):
+    """(min, max) of a coordinate, read from its endpoints when it is 1-D and monotonic"""
+    if values.ndim == 1:
+        steps = np.diff(values)
+        if (steps >= 0).all() or (steps <= 0).all():
+            first, last = float(values[0]), float(values[-1])
+            return min(first, last), max(first, last)
+    # Curvilinear (2-D), wrapped or NaN-holding coordinates need the full scan
+    return float(np.nanmin(values)), float(np.nanmax(values))
+
+def stride_coordinate(values: np.ndarray, dims, steps: Dict[str, int]) -> np.ndarray:
+    """Subsample coordinate values along whichever of its dims are strided"""
+    return values[tuple(slice(None, None, steps.get(dim, 1)) for dim in dims)]
+
+def read_strided(var, steps: Dict[str, int]) -> np.ndarray:
+    """Read a netCDF4 variable with per-dimension strides, taking index 0 of other dims"""
+    key = tuple(
+        slice(None, None, steps[dim]) if dim in steps else 0
+        for dim in var.dimensions
+    )
+    return np.ma.filled(var[key].astype(np.float32), np.nan)
+
+def clean_wind_components(u: np.ndarray, v: np.ndarray):
+    """Zero NaNs in u/v in place, copying only arrays that aren't writeable, owned float32"""
+    # Owning the buffer rules out views into a cached dataset's data
+    u = np.require(u, dtype=np.float32, requirements=['C', 'W', 'O'])
+    v = np.require(v, dtype=np.float32, requirements=['C', 'W', 'O'])
+    np.nan_to_num(u, copy=False, nan=0.0)
+    np.nan_to_num(v, copy=False, nan=0.0)
+    return u, v
+
+# Wind component name fragments, in order of preference
+U_PATTERNS = ('u', 'u10', 'u_wind', 'u_component', 'eastward')
+V_PATTERNS = ('v', 'v10', 'v_wind', 'v_component', 'northward')
+
+def find_wind_components(variables: List[str]) -> Optional[Dict[str, str]]:
+    """Find U and V wind components among the dataset's data variable names"""
+    # Index each variable by what's left of its name once a pattern is
+    # removed; a U and V variable sharing a stem are a pair
+    u_stems = {}
+    v_stems = {}
+    for var in variables:
+        var_lower = var.lower()
+        for pattern in U_PATTERNS:
+            if pattern in var_lower:
+                u_stems.setdefault(var_lower.replace(pattern, ''), var)
+        for pattern in V_PATTERNS:
+            if pattern in var_lower:
+                v_stems.setdefault(var_lower.replace(pattern, ''), var)
     
-    # Look for matching pairs
-    for u_pattern in u_patterns:
-        for v_pattern in v_patterns:
-            u_matches = [v for v in variables if u_pattern in v.lower()]
-            v_matches = [v for v in variables if v_pattern in v.lower()]
-            
-            if u_matches and v_matches:
-                # Try to find corresponding pairs
-                for u_var in u_matches:
-                    for v_var in v_matches:
-                        # Check if they seem to be a pair
-                        if u_var.replace(u_pattern, '') == v_var.replace(v_pattern, ''):
-                            return {"u": u_var, "v": v_var}
+    for stem, u_var in u_stems.items():
+        v_var = v_stems.get(stem)
+        if v_var and v_var != u_var:
+            return {"u": u_var, "v": v_var}
     
     return None
 
+def compute_wind_response(session_id: str, time_index: int, level_index: Optional[int]) -> Dict:
+    """Read and subsample a session's wind grids; runs on a worker thread"""
+    with session_dataset(session_id) as ds:
+        return read_wind_grids(ds, time_index, level_index)
+
+def read_wind_grids(ds: xr.Dataset, time_index: int, level_index: Optional[int]) -> Dict:
+    """Wind-data response body for one time/level of an open dataset"""
+    # Find wind components
+    wind_components = find_wind_components(list(ds.data_vars))
+    if not wind_components:
+        raise HTTPException(404, "No wind data found")
+    
+    # Get wind data
+    u_var = ds[wind_components['u']]
+    v_var = ds[wind_components['v']]
+    
+    # Handle dimensions
+    if 'time' in u_var.dims:
+        u_var = u_var.isel(time=time_index)
+        v_var = v_var.isel(time=time_index)
+    
+    if level_index is not None and 'level' in u_var.dims:
+        u_var = u_var.isel(level=level_index)
+        v_var = v_var.isel(level=level_index)
+    
+    # Get coordinate names
+    lat_name = None
+    lon_name = None
+    for coord in ['lat', 'latitude', 'y']:
+        if coord in ds.coords:
+            lat_name = coord
+            break
+    for coord in ['lon', 'longitude', 'x']:
+        if coord in ds.coords:
+            lon_name = coord
+            break
+    
+    # Subsample if data is too large
+    max_points = 150  # Increased from 100 for better resolution
+    # The grid's last two dims are (y, x) for both 1-D and curvilinear coordinates
+    lat_dim, lon_dim = u_var.dims[-2:]
+    lat_step = max(1, u_var.sizes[lat_dim] // max_points)
+    lon_step = max(1, u_var.sizes[lon_dim] // max_points)
+    
+    # Stride lazily so only the sampled cells are read from disk
+    stride = {
+        lat_dim: slice(None, None, lat_step),
+        lon_dim: slice(None, None, lon_step)
+    }
+    lats_sub = ds[lat_name].isel(stride, missing_dims='ignore').values
+    lons_sub = ds[lon_name].isel(stride, missing_dims='ignore').values
+    u_sub = u_var.isel(stride).values
+    v_sub = v_var.isel(stride).values
+    
+    # Handle NaN values, then calculate wind speed from the cleaned grids
+    u_sub, v_sub = clean_wind_components(u_sub, v_sub)
+    speed = np.hypot(u_sub, v_sub)
+    
+    return {
+        "success": True,
+        "grid": {
+            "lats": np.ascontiguousarray(lats_sub),
+            "lons": np.ascontiguousarray(lons_sub),
+            "shape": list(u_sub.shape)
+        },
+        "u_component": u_sub,
+        "v_component": v_sub,
+        "speed": speed,
+        "metadata": {
+            "units": u_var.attrs.get('units', 'm/s'),
+            "time_index": time_index,
+            "level_index": level_index
+        }
+    }
+
 @app.get("/api/wind-data/{session_id}")
 async def get_wind_data(
     session_id: str,
@@ -257,79 +436,8 @@ async def get_wind_data(
         raise HTTPException(404, "Session not found")
     
     try:
-        file_path = Path(active_sessions[session_id]["file_path"])
-        ds = xr.open_dataset(file_path)
-        
-        # Find wind components
-        wind_components = find_wind_components(ds)
-        if not wind_components:
-            raise HTTPException(404, "No wind data found")
-        
-        # Get wind data
-        u_var = ds[wind_components['u']]
-        v_var = ds[wind_components['v']]
-        
-        # Handle dimensions
-        if 'time' in u_var.dims:
-            u_var = u_var.isel(time=time_index)
-            v_var = v_var.isel(time=time_index)
-        
-        if level_index is not None and 'level' in u_var.dims:
-            u_var = u_var.isel(level=level_index)
-            v_var = v_var.isel(level=level_index)
-        
-        # Get coordinate names
-        lat_name = None
-        lon_name = None
-        for coord in ['lat', 'latitude', 'y']:
-            if coord in ds.coords:
-                lat_name = coord
-                break
-        for coord in ['lon', 'longitude', 'x']:
-            if coord in ds.coords:
-                lon_name = coord
-                break
-        
-        # Create grid data for wind animation
-        lats = ds[lat_name].values
-        lons = ds[lon_name].values
-        
-        # Subsample if data is too large
-        max_points = 150  # Increased from 100 for better resolution
-        lat_step = max(1, len(lats) // max_points)
-        lon_step = max(1, len(lons) // max_points)
-        
-        lats_sub = lats[::lat_step]
-        lons_sub = lons[::lon_step]
-        u_sub = u_var.values[::lat_step, ::lon_step]
-        v_sub = v_var.values[::lat_step, ::lon_step]
-        
-        # Calculate wind speed
-        speed = np.sqrt(u_sub**2 + v_sub**2)
-        
-        # Handle NaN values
-        u_sub = np.nan_to_num(u_sub, nan=0.0)
-        v_sub = np.nan_to_num(v_sub, nan=0.0)
-        speed = np.nan_to_num(speed, nan=0.0)
-        
-        ds.close()
-        
-        return JSONResponse({
-            "success": True,
-            "grid": {
-                "lats": lats_sub.tolist(),
-                "lons": lons_sub.tolist(),
-                "shape": list(u_sub.shape)
-            },
-            "u_component": u_sub.tolist(),
-            "v_component": v_sub.tolist(),
-            "speed": speed.tolist(),
-            "metadata": {
-                "units": u_var.attrs.get('units', 'm/s'),
-                "time_index": time_index,
-                "level_index": level_index
-            }
-        })
+        payload = await asyncio.to_thread(compute_wind_response, session_id, time_index, level_index)
+        return ORJSONResponse(payload)
         
     except Exception as e:
         logger.error(f"Error getting wind data: {str(e)}")
@@ -339,6 +447,8 @@ async def get_wind_data(
 async def delete_session(session_id: str):
     """Clean up session data"""
     if session_id in active_sessions:
+        close_session_dataset(session_id)
+        
         # Delete file
         file_path = Path(active_sessions[session_id]["file_path"])
         if file_path.exists():
@@ -364,15 +474,16 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     """Clean up old files on startup"""
-    for file_path in Config.UPLOAD_DIR.glob("*"):
-        if file_path.is_file():
+    # Delete files older than 1 hour; DirEntry caches its type and stat
+    cutoff_time = datetime.now().timestamp() - 3600
+    with os.scandir(Config.UPLOAD_DIR) as entries:
+        for entry in entries:
             try:
-                # Delete files older than 1 hour
-                if (datetime.now().timestamp() - file_path.stat().st_mtime) > 3600:
-                    file_path.unlink()
-                    logger.info(f"Cleaned up old file: {file_path}")
+                if entry.is_file(follow_symlinks=False) and entry.stat().st_mtime < cutoff_time:
+                    os.unlink(entry.path)
+                    logger.info(f"Cleaned up old file: {entry.path}")
             except Exception as e:
-                logger.error(f"Error cleaning up {file_path}: {e}")
+                logger.error(f"Error cleaning up {entry.path}: {e}")
 
 if __name__ == "__main__":
     import uvicorn
@@ -9,6 +9,9 @@ import xarray as xr
 from datetime import datetime, timedelta
 import os
 
+# Seeded PCG64 generator so sample files are reproducible
+rng = np.random.default_rng(0)
+
 def create_sample_wind_netcdf(filename="sample_wind_data.nc", include_multiple_times=False):
     """Create a sample NetCDF file with wind components optimized for raster-array"""
     
@@ -16,8 +19,9 @@ def create_sample_wind_netcdf(filename="sample_wind_data.nc", include_multiple_t
     
     # Define dimensions - use regular grid for better compatibility
     # Reduced resolution for smaller file size and better processing
-    lat = np.linspace(-90, 90, 37)  # 5 degree resolution (37 points)
-    lon = np.linspace(-180, 180, 73)  # 5 degree resolution (73 points)
+    # float32 from the start so the whole synthesis runs in single precision
+    lat = np.linspace(-90, 90, 37, dtype=np.float32)  # 5 degree resolution (37 points)
+    lon = np.linspace(-180, 180, 73, dtype=np.float32)  # 5 degree resolution (73 points)
     
     # Time dimension
     if include_multiple_times:
@@ -33,54 +37,47 @@ def create_sample_wind_netcdf(filename="sample_wind_data.nc", include_multiple_t
     # Create coordinate arrays
     lon_grid, lat_grid = np.meshgrid(lon, lat)
     
-    # Initialize arrays for all time steps
-    u_wind_all = []
-    v_wind_all = []
-    
-    for t_idx, t in enumerate(time):
-        # Create synthetic wind field that varies with time
-        phase_shift = t_idx * np.pi / 6 if include_multiple_times else 0
-        
-        # U component (eastward wind)
-        # Create a jet stream pattern
-        u_wind = 15 * np.exp(-((lat_grid - 40)**2) / 300) * np.sin((lon_grid + phase_shift * 30) * np.pi / 180)
-        
-        # Add tropical easterlies
-        u_wind += -10 * np.exp(-((lat_grid)**2) / 100) * np.cos(lon_grid * np.pi / 180)
-        
-        # Add some variation
-        u_wind += 3 * np.sin(lat_grid * np.pi / 90) * np.cos((lon_grid + phase_shift * 20) * np.pi / 60)
-        
-        # V component (northward wind) 
-        # Create circulation patterns
-        v_wind = 8 * np.sin((lon_grid + phase_shift * 40) * np.pi / 120) * np.cos(lat_grid * np.pi / 180)
-        v_wind += 4 * np.cos(lon_grid * np.pi / 90 + np.pi/4 + phase_shift)
-        
-        # Add some controlled noise for realism (less noise for cleaner visualization)
-        u_wind += np.random.normal(0, 1, u_wind.shape)
-        v_wind += np.random.normal(0, 1, v_wind.shape)
-        
-        # Ensure no extreme values that might cause issues
-        u_wind = np.clip(u_wind, -50, 50)
-        v_wind = np.clip(v_wind, -50, 50)
-        
-        u_wind_all.append(u_wind)
-        v_wind_all.append(v_wind)
-    
-    # Stack arrays for time dimension
-    u_wind_all = np.stack(u_wind_all, axis=0)
-    v_wind_all = np.stack(v_wind_all, axis=0)
+    # Phase of the synthetic pattern per time step, shaped to broadcast over the grid
+    if include_multiple_times:
+        phase_shift = (np.arange(len(time), dtype=np.float32) * np.float32(np.pi / 6))[:, np.newaxis, np.newaxis]
+    else:
+        phase_shift = np.zeros((len(time), 1, 1), dtype=np.float32)
+    
+    # Create synthetic wind field that varies with time, all steps at once
+    # U component (eastward wind)
+    # Create a jet stream pattern
+    u_wind_all = 15 * np.exp(-((lat_grid - 40)**2) / 300) * np.sin((lon_grid + phase_shift * 30) * np.pi / 180)
+    
+    # Add tropical easterlies
+    u_wind_all += -10 * np.exp(-((lat_grid)**2) / 100) * np.cos(lon_grid * np.pi / 180)
+    
+    # Add some variation
+    u_wind_all += 3 * np.sin(lat_grid * np.pi / 90) * np.cos((lon_grid + phase_shift * 20) * np.pi / 60)
+    
+    # V component (northward wind) 
+    # Create circulation patterns
+    v_wind_all = 8 * np.sin((lon_grid + phase_shift * 40) * np.pi / 120) * np.cos(lat_grid * np.pi / 180)
+    v_wind_all += 4 * np.cos(lon_grid * np.pi / 90 + np.pi/4 + phase_shift)
+    
+    # Add some controlled noise for realism (less noise for cleaner visualization)
+    noise = np.empty(u_wind_all.shape, dtype=np.float32)
+    u_wind_all += rng.standard_normal(dtype=np.float32, out=noise)
+    v_wind_all += rng.standard_normal(dtype=np.float32, out=noise)
+    
+    # Ensure no extreme values that might cause issues
+    np.clip(u_wind_all, -50, 50, out=u_wind_all)
+    np.clip(v_wind_all, -50, 50, out=v_wind_all)
     
     # Create the dataset with proper structure
     ds = xr.Dataset(
         {
             "u10": xr.DataArray(
-                u_wind_all.astype(np.float32),  # Use float32 for better compatibility
+                u_wind_all,  # Already float32 for better compatibility
                 dims=["time", "lat", "lon"],
                 coords={
                     "time": time, 
-                    "lat": lat.astype(np.float32), 
-                    "lon": lon.astype(np.float32)
+                    "lat": lat, 
+                    "lon": lon
                 },
                 attrs={
                     "units": "m/s",
@@ -90,12 +87,12 @@ def create_sample_wind_netcdf(filename="sample_wind_data.nc", include_multiple_t
                 }
             ),
             "v10": xr.DataArray(
-                v_wind_all.astype(np.float32),
+                v_wind_all,
                 dims=["time", "lat", "lon"],
                 coords={
                     "time": time, 
-                    "lat": lat.astype(np.float32), 
-                    "lon": lon.astype(np.float32)
+                    "lat": lat, 
+                    "lon": lon
                 },
                 attrs={
                     "units": "m/s",
@@ -250,8 +247,8 @@ def create_high_res_sample(filename="sample_wind_highres.nc"):
     print(f"Creating high-resolution NetCDF file: {filename}")
     
     # Higher resolution grid
-    lat = np.linspace(-90, 90, 181)  # 1 degree resolution
-    lon = np.linspace(-180, 180, 361)  # 1 degree resolution
+    lat = np.linspace(-90, 90, 181, dtype=np.float32)  # 1 degree resolution
+    lon = np.linspace(-180, 180, 361, dtype=np.float32)  # 1 degree resolution
     time = [datetime(2024, 1, 1, 0, 0)]
     
     print(f"Grid size: {len(lat)} x {len(lon)}")
@@ -268,8 +265,13 @@ def create_high_res_sample(filename="sample_wind_highres.nc"):
     v_wind += 10 * np.cos(lon_grid * np.pi / 120 + np.pi/3) * np.sin(lat_grid * np.pi / 180)
     
     # Less noise for cleaner visualization
-    u_wind += np.random.normal(0, 0.5, u_wind.shape)
-    v_wind += np.random.normal(0, 0.5, v_wind.shape)
+    noise = np.empty(u_wind.shape, dtype=np.float32)
+    rng.standard_normal(dtype=np.float32, out=noise)
+    noise *= 0.5
+    u_wind += noise
+    rng.standard_normal(dtype=np.float32, out=noise)
+    noise *= 0.5
+    v_wind += noise
     
     # Clip values
     u_wind = np.clip(u_wind, -60, 60)
@@ -279,7 +281,7 @@ def create_high_res_sample(filename="sample_wind_highres.nc"):
     ds = xr.Dataset(
         {
             "u10": xr.DataArray(
-                u_wind[np.newaxis, :, :].astype(np.float32),
+                u_wind[np.newaxis, :, :],
                 dims=["time", "lat", "lon"],
                 coords={"time": time, "lat": lat, "lon": lon},
                 attrs={
@@ -289,7 +291,7 @@ def create_high_res_sample(filename="sample_wind_highres.nc"):
                 }
             ),
             "v10": xr.DataArray(
-                v_wind[np.newaxis, :, :].astype(np.float32),
+                v_wind[np.newaxis, :, :],
                 dims=["time", "lat", "lon"],
                 coords={"time": time, "lat": lat, "lon": lon},
                 attrs={
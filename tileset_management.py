@@ -4,6 +4,7 @@ Handles creation and management of Mapbox tilesets from NetCDF data
 """
 
 import os
+import re
 import json
 import logging
 import tempfile
@@ -17,6 +18,12 @@ import time
 
 logger = logging.getLogger(__name__)
 
+# Wind component names: a known prefix that isn't followed by more letters
+# (matches u10, eastward_wind, UGRD_10maboveground but not temperature).
+# app.py uses the same patterns so both pick the same variables.
+U_WIND_RE = re.compile(r'^(?:u|u10|u_wind|u_component|eastward|ugrd|u-component|uas|uwnd|u-wind|uwind)(?![a-z])', re.IGNORECASE)
+V_WIND_RE = re.compile(r'^(?:v|v10|v_wind|v_component|northward|vgrd|v-component|vas|vwnd|v-wind|vwind)(?![a-z])', re.IGNORECASE)
+
 
 class MapboxTilesetManager:
     """Manages Mapbox tileset operations"""
@@ -25,6 +32,12 @@ class MapboxTilesetManager:
         self.access_token = access_token
         self.username = username
         self.api_base = "https://api.mapbox.com"
+        # Pooled connections so repeated API calls skip the TCP/TLS handshake
+        self.session = requests.Session()
+    
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.session.close()
         
     def process_netcdf_to_tileset(self, netcdf_path: str, tileset_id: str, recipe: Dict = None) -> Dict[str, Any]:
         """Process NetCDF to vector tileset with proper error handling"""
@@ -115,7 +128,7 @@ class MapboxTilesetManager:
         try:
             # First, delete any existing source with the same ID
             delete_url = f"{self.api_base}/tilesets/v1/sources/{self.username}/{source_id}?access_token={self.access_token}"
-            delete_response = requests.delete(delete_url)
+            delete_response = self.session.delete(delete_url)
             if delete_response.status_code == 204:
                 logger.info(f"Deleted existing source: {source_id}")
             
@@ -133,7 +146,7 @@ class MapboxTilesetManager:
             
             logger.info(f"Uploading source: {source_id} ({len(file_content)} bytes)")
             
-            response = requests.post(url, files=files)
+            response = self.session.post(url, files=files)
             
             logger.info(f"Source upload response: {response.status_code}")
             if response.text:
@@ -174,7 +187,7 @@ class MapboxTilesetManager:
         try:
             # First, try to delete any existing tileset
             delete_url = f"{self.api_base}/tilesets/v1/{self.username}.{tileset_id}?access_token={self.access_token}"
-            delete_response = requests.delete(delete_url)
+            delete_response = self.session.delete(delete_url)
             if delete_response.status_code == 204:
                 logger.info(f"Deleted existing tileset: {tileset_id}")
                 # Wait a moment for deletion to process
@@ -196,7 +209,7 @@ class MapboxTilesetManager:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(
+            response = self.session.post(
                 url,
                 json=data,
                 headers=headers
@@ -235,7 +248,7 @@ class MapboxTilesetManager:
         try:
             url = f"{self.api_base}/tilesets/v1/{self.username}.{tileset_id}/publish?access_token={self.access_token}"
             
-            response = requests.post(url)
+            response = self.session.post(url)
             
             logger.info(f"Publish tileset response: {response.status_code}")
             if response.text:
@@ -273,7 +286,7 @@ class MapboxTilesetManager:
                 tileset_id = f"{self.username}.{tileset_id}"
             
             url = f"{self.api_base}/tilesets/v1/{tileset_id}?access_token={self.access_token}"
-            response = requests.get(url)
+            response = self.session.get(url)
             
             if response.status_code == 200:
                 tileset_info = response.json()
@@ -350,7 +363,7 @@ class MapboxTilesetManager:
                     if format_check.get('format') == 'raster-array':
                         # Check if there are any active jobs
                         jobs_url = f"{self.api_base}/tilesets/v1/{tileset_id}/jobs?access_token={self.access_token}&limit=1"
-                        jobs_response = requests.get(jobs_url)
+                        jobs_response = self.session.get(jobs_url)
                         
                         if jobs_response.status_code == 200:
                             jobs = jobs_response.json()
@@ -508,28 +521,17 @@ class MapboxTilesetManager:
     
     def _find_wind_components(self, ds) -> Tuple[Optional[str], Optional[str]]:
         """Find U and V wind components in dataset"""
-        u_patterns = ['u', 'u10', 'u_wind', 'u_component', 'eastward', 'ugrd', 'uas', 'u-wind', 'uwind']
-        v_patterns = ['v', 'v10', 'v_wind', 'v_component', 'northward', 'vgrd', 'vas', 'v-wind', 'vwind']
-        
         u_var = None
         v_var = None
         
         for var in ds.data_vars:
-            var_lower = var.lower()
-            
-            if not u_var:
-                for pattern in u_patterns:
-                    if pattern in var_lower or var_lower == pattern:
-                        u_var = var
-                        logger.info(f"Found U component: {var}")
-                        break
-            
-            if not v_var:
-                for pattern in v_patterns:
-                    if pattern in var_lower or var_lower == pattern:
-                        v_var = var
-                        logger.info(f"Found V component: {var}")
-                        break
+            if not u_var and U_WIND_RE.match(var):
+                u_var = var
+                logger.info(f"Found U component: {var}")
+            
+            if not v_var and V_WIND_RE.match(var):
+                v_var = var
+                logger.info(f"Found V component: {var}")
             
             if u_var and v_var:
                 break
@@ -608,7 +610,7 @@ class MapboxTilesetManager:
                 
             url = f"{self.api_base}/tilesets/v1/{tileset_id}?access_token={self.access_token}"
             
-            response = requests.get(url)
+            response = self.session.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -627,7 +629,7 @@ class MapboxTilesetManager:
         try:
             url = f"{self.api_base}/tilesets/v1/{self.username}?access_token={self.access_token}&limit={limit}"
             
-            response = requests.get(url)
+            response = self.session.get(url)
             
             if response.status_code == 200:
                 return response.json()
@@ -647,7 +649,7 @@ class MapboxTilesetManager:
         try:
             url = f"{self.api_base}/tilesets/v1/{self.username}.{tileset_id}?access_token={self.access_token}"
             
-            response = requests.delete(url)
+            response = self.session.delete(url)
             
             if response.status_code == 204:
                 logger.info(f"Successfully deleted tileset: {tileset_id}")
@@ -668,7 +670,7 @@ class MapboxTilesetManager:
         try:
             url = f"{self.api_base}/tilesets/v1/{self.username}.{tileset_id}/jobs/{job_id}?access_token={self.access_token}"
             
-            response = requests.get(url)
+            response = self.session.get(url)
             
             if response.status_code == 200:
                 return response.json()